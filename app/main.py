@@ -6,8 +6,8 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import streamlit.components.v1 as components
 import folium
-from streamlit_folium import st_folium
 import numpy as np
 from pathlib import Path
 from typing import Optional, Dict, Any, List
@@ -21,9 +21,28 @@ logger = logging.getLogger(__name__)
 from components.search_engine import SearchEngine
 from components.map_visualizer import MapVisualizer
 from components.analytics_dashboard import AnalyticsDashboard
-from utils.data_loader import DataLoader
+from utils.data_loader import DataLoader, CATEGORICAL_COLUMNS
 from utils.constants import APP_CONFIG
-from config.settings import DASHBOARD_CONFIG
+from config.settings import DASHBOARD_CONFIG, MAX_ROWS_DISPLAY, CACHE_TTL
+
+# Sidebar filter keys and the dataframe column each one applies to
+FILTER_COLUMNS = {
+    'facility_type': 'Facility Type',
+    'ownership': 'Ownership',
+    'state': 'State',
+    'abdm_enabled': 'ABDM Enabled'
+}
+
+# Columns shown in the Data Explorer table, where present (relevance_score
+# only on search results); the CSV download still carries every column
+DISPLAY_COLUMNS = ['Name', 'Facility Type', 'Ownership', 'Address', 'State', 'ABDM Enabled', 'relevance_score']
+
+# Sidebar quick-search buttons and the query each one fills in
+QUICK_SEARCHES = (
+    ("🏥 Government Hospitals", "government hospitals"),
+    ("🏩 Private Clinics", "private clinics"),
+    ("🏢 Community Health Centers", "community health centers")
+)
 
 
 def configure_page() -> None:
@@ -114,6 +133,16 @@ def initialize_search_engine(df: pd.DataFrame) -> Optional[SearchEngine]:
         return None
 
 
+@st.cache_data
+def get_filter_options(df: pd.DataFrame) -> Dict[str, tuple]:
+    """Compute and cache the sorted selectbox options for each filter column"""
+    return {
+        col: ('All',) + tuple(sorted(df[col].dropna().unique()))
+        for col in CATEGORICAL_COLUMNS
+        if col in df.columns
+    }
+
+
 def render_header() -> None:
     """Render the main dashboard header"""
     st.markdown(
@@ -131,6 +160,11 @@ def render_header() -> None:
     )
 
 
+def set_search_query(query: str) -> None:
+    """Button callback that writes a quick-search query into the search box"""
+    st.session_state['search_query'] = query
+
+
 def render_sidebar(df: pd.DataFrame, search_engine: Optional[SearchEngine]) -> Dict[str, Any]:
     """Render sidebar controls and return filter selections"""
     st.sidebar.header("🔍 Search & Filters")
@@ -143,45 +177,42 @@ def render_sidebar(df: pd.DataFrame, search_engine: Optional[SearchEngine]) -> D
         "Describe what you're looking for:",
         placeholder="e.g., 'government hospitals in Maharashtra', 'private clinics with ABDM', 'community health centers in rural areas'",
         height=100,
-        help="Use natural language to search for specific types of facilities, locations, or characteristics"
+        help="Use natural language to search for specific types of facilities, locations, or characteristics",
+        key='search_query'
     )
-    filters['search_query'] = search_query
     
-    # Quick Search Examples
-    if st.sidebar.button("🏥 Government Hospitals"):
-        filters['search_query'] = "government hospitals"
-    if st.sidebar.button("🏩 Private Clinics"):
-        filters['search_query'] = "private clinics"
-    if st.sidebar.button("🏢 Community Health Centers"):
-        filters['search_query'] = "community health centers"
+    # Quick Search Examples: the callbacks run before the rerun, so the text
+    # area already holds the chosen query and only that query is searched
+    for label, query in QUICK_SEARCHES:
+        st.sidebar.button(label, on_click=set_search_query, args=(query,))
+    
+    filters['search_query'] = search_query
     
     st.sidebar.markdown("---")
     
     # Traditional Filters
     st.sidebar.markdown("### 🎛️ Filter Options")
+    filter_options = get_filter_options(df)
     
     # Facility Type
-    facility_types = ['All'] + sorted(df['Facility Type'].dropna().unique().tolist())
     filters['facility_type'] = st.sidebar.selectbox(
         "🏥 Facility Type:", 
-        facility_types,
+        filter_options['Facility Type'],
         help="Filter by specific type of healthcare facility"
     )
     
     # Ownership
-    ownership_types = ['All'] + sorted(df['Ownership'].dropna().unique().tolist())
     filters['ownership'] = st.sidebar.selectbox(
         "🏛️ Ownership:", 
-        ownership_types,
+        filter_options['Ownership'],
         help="Filter by facility ownership type"
     )
     
     # State filter (if state column exists)
     if 'State' in df.columns:
-        states = ['All'] + sorted(df['State'].dropna().unique().tolist())
         filters['state'] = st.sidebar.selectbox(
             "🗺️ State:", 
-            states,
+            filter_options['State'],
             help="Filter by state/region"
         )
     
@@ -197,35 +228,102 @@ def render_sidebar(df: pd.DataFrame, search_engine: Optional[SearchEngine]) -> D
     return filters
 
 
+def get_dataset_key(df: pd.DataFrame) -> tuple:
+    """Return a cheap fingerprint of the loaded dataset for keying cached results"""
+    # The source file's path, mtime and size change whenever the master CSV
+    # is edited or refreshed, even when the shape stays the same
+    return (DataLoader().master_file_key(), df.shape, tuple(df.columns))
+
+
+def get_filter_key(df: pd.DataFrame, filters: Dict[str, Any]) -> tuple:
+    """Return a hashable key for the dataset and the current filter selections"""
+    return (get_dataset_key(df), tuple(sorted(filters.items())))
+
+
+@st.cache_data(max_entries=16)
+def search_facilities(_df: pd.DataFrame, _search_engine: SearchEngine, dataset_key: tuple, search_query: str) -> pd.DataFrame:
+    """Run and cache the natural language search for a query"""
+    return _search_engine.search(search_query, _df)
+
+
+@st.cache_data(max_entries=32)
+def filter_facilities(_df: pd.DataFrame, filter_key: tuple) -> pd.DataFrame:
+    """Apply and cache the sidebar column filters for a given filter key"""
+    filters = dict(filter_key[1])
+    active = {
+        column: filters[filter_name]
+        for filter_name, column in FILTER_COLUMNS.items()
+        if filters.get(filter_name, 'All') != 'All'
+    }
+    if not active:
+        return _df
+    
+    # Apply traditional filters as one combined mask so the frame is sliced once
+    mask = np.ones(len(_df), dtype=bool)
+    for column, value in active.items():
+        mask &= (_df[column] == value).to_numpy()
+    
+    if mask.all():
+        return _df
+    return _df[mask]
+
+
 def apply_filters(df: pd.DataFrame, filters: Dict[str, Any], search_engine: Optional[SearchEngine]) -> pd.DataFrame:
     """Apply all filters to the dataframe"""
-    df_filtered = df.copy()
+    # No defensive copy: search results and mask slices are already new frames
+    df_filtered = df
     
     # Apply natural language search
     if filters['search_query'].strip() and search_engine:
         with st.spinner("🔍 Searching..."):
-            df_filtered = search_engine.search(filters['search_query'], df_filtered)
+            df_filtered = search_facilities(
+                df_filtered, search_engine, get_dataset_key(df), filters['search_query']
+            )
             st.sidebar.success(f"Found {len(df_filtered):,} matching facilities")
     
-    # Apply traditional filters
-    if filters['facility_type'] != 'All':
-        df_filtered = df_filtered[df_filtered['Facility Type'] == filters['facility_type']]
-    
-    if filters['ownership'] != 'All':
-        df_filtered = df_filtered[df_filtered['Ownership'] == filters['ownership']]
-    
-    if 'state' in filters and filters['state'] != 'All':
-        df_filtered = df_filtered[df_filtered['State'] == filters['state']]
-    
-    if 'abdm_enabled' in filters and filters['abdm_enabled'] != 'All':
-        df_filtered = df_filtered[df_filtered['ABDM Enabled'] == filters['abdm_enabled']]
-    
-    return df_filtered
+    # Results are cached on the filter selections, so reruns triggered by
+    # unrelated widgets look the filtered frame up instead of recomputing it
+    return filter_facilities(df_filtered, get_filter_key(df, filters))
+
+
+@st.cache_resource
+def get_map_visualizer() -> MapVisualizer:
+    """Create and cache the map visualizer shared across reruns"""
+    return MapVisualizer()
+
+
+@st.cache_data(max_entries=16, ttl=CACHE_TTL, show_spinner=False)
+def build_map_html(_df_filtered: pd.DataFrame, filter_key: tuple, color_by: str = 'facility_type') -> Optional[str]:
+    """Build the facilities map and cache its rendered HTML on the filter key and color scheme"""
+    map_obj = get_map_visualizer().create_facility_map(_df_filtered, color_by=color_by)
+    if map_obj is None:
+        return None
+    return map_obj.get_root().render()
+
+
+@st.cache_data(max_entries=8)
+def export_csv(_df_filtered: pd.DataFrame, filter_key: tuple) -> bytes:
+    """Encode the filtered facilities as CSV, cached on the filter key"""
+    return _df_filtered.to_csv(index=False).encode('utf-8')
+
+
+def count_values(series: pd.Series, values: tuple) -> Dict[Any, int]:
+    """Count occurrences of each of values in series with a single pass"""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # One bincount over the category codes covers every value at once
+        codes = series.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(series.cat.categories))
+        positions = series.cat.categories.get_indexer(list(values))
+        return {value: int(counts[pos]) if pos >= 0 else 0 for value, pos in zip(values, positions)}
+    
+    counts = series.value_counts()
+    return {value: int(counts.get(value, 0)) for value in values}
 
 
 def render_metrics(df_filtered: pd.DataFrame, df_total: pd.DataFrame) -> None:
     """Render key metrics in columns"""
     col1, col2, col3, col4 = st.columns(4)
+    ownership_counts = count_values(df_filtered['Ownership'], ('Government', 'Private'))
     
     with col1:
         st.markdown('<div class="metric-container">', unsafe_allow_html=True)
@@ -246,7 +344,7 @@ def render_metrics(df_filtered: pd.DataFrame, df_total: pd.DataFrame) -> None:
     
     with col3:
         st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-        gov_facilities = len(df_filtered[df_filtered['Ownership'] == 'Government'])
+        gov_facilities = ownership_counts['Government']
         st.metric(
             "Government", 
             f"{gov_facilities:,}",
@@ -256,7 +354,7 @@ def render_metrics(df_filtered: pd.DataFrame, df_total: pd.DataFrame) -> None:
     
     with col4:
         st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-        private_facilities = len(df_filtered[df_filtered['Ownership'] == 'Private'])
+        private_facilities = ownership_counts['Private']
         st.metric(
             "Private", 
             f"{private_facilities:,}",
@@ -291,6 +389,7 @@ def main() -> None:
     
     # Apply filters
     df_filtered = apply_filters(df, filters, search_engine)
+    filter_key = get_filter_key(df, filters)
     
     # Render metrics
     render_metrics(df_filtered, df)
@@ -301,10 +400,10 @@ def main() -> None:
     with tab1:
         st.subheader("🗺️ Healthcare Facilities Map")
         if not df_filtered.empty:
-            map_viz = MapVisualizer()
-            map_obj = map_viz.create_facility_map(df_filtered)
-            if map_obj:
-                st_folium(map_obj, width=1200, height=600)
+            # Folium rendering is the slow part, so the finished HTML is cached
+            map_html = build_map_html(df_filtered, filter_key)
+            if map_html:
+                components.html(map_html, height=600)
         else:
             st.info("No facilities match the current filters")
     
@@ -312,25 +411,26 @@ def main() -> None:
         st.subheader("📈 Analytics Dashboard")
         if not df_filtered.empty:
             analytics = AnalyticsDashboard()
-            analytics.render_analytics(df_filtered)
+            analytics.render_analytics(df_filtered, cache_key=filter_key)
         else:
             st.info("No data available for analytics")
     
     with tab3:
         st.subheader("📋 Facility Data")
         if not df_filtered.empty:
-            # Data table with enhanced features
+            # Data table with enhanced features; only the displayed columns
+            # of the shown rows are serialized to the browser
+            display_cols = [col for col in DISPLAY_COLUMNS if col in df_filtered.columns]
             st.dataframe(
-                df_filtered.head(1000),  # Limit for performance
+                df_filtered.iloc[:MAX_ROWS_DISPLAY][display_cols],
                 use_container_width=True,
                 height=400
             )
             
-            # Download button
-            csv = df_filtered.to_csv(index=False)
+            # Download button (CSV is encoded once per filter selection)
             st.download_button(
                 label="📥 Download Filtered Data (CSV)",
-                data=csv,
+                data=export_csv(df_filtered, filter_key),
                 file_name=f"nha_facilities_{pd.Timestamp.now().strftime('%Y%m%d_%H%M%S')}.csv",
                 mime="text/csv"
             )
@@ -5,10 +5,23 @@ Quick Dataset Deduplication Summary Script
 This script provides a quick summary of the deduplication results.
 """
 
-import pandas as pd
+import pyarrow.csv as pacsv
 import os
 from pathlib import Path
 
+
+def load_names(csv_path):
+    """Read only the Name column of a dataset CSV"""
+    table = pacsv.read_csv(
+        csv_path,
+        parse_options=pacsv.ParseOptions(newlines_in_values=True),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=['Name'], strings_can_be_null=True
+        )
+    )
+    return table.column('Name').to_pandas()
+
+
 def main():
     """Display deduplication summary"""
     print("🏥 NHA Healthcare Facilities Dataset Deduplication Summary")
@@ -25,9 +38,9 @@ def main():
         return
     
     print(f"📁 Original dataset: {original_file}")
-    df_original = pd.read_csv(original_file, low_memory=False)
-    original_count = len(df_original)
-    original_unique_names = df_original['Name'].nunique()
+    original_names = load_names(original_file)
+    original_count = len(original_names)
+    original_unique_names = original_names.nunique()
     
     print(f"   Total records: {original_count:,}")
     print(f"   Unique names: {original_unique_names:,}")
@@ -37,9 +50,9 @@ def main():
     # Check deduplicated dataset
     if dedup_file.exists():
         print(f"\n📁 Deduplicated dataset: {dedup_file}")
-        df_dedup = pd.read_csv(dedup_file, low_memory=False)
-        dedup_count = len(df_dedup)
-        dedup_unique_names = df_dedup['Name'].nunique()
+        dedup_names = load_names(dedup_file)
+        dedup_count = len(dedup_names)
+        dedup_unique_names = dedup_names.nunique()
         
         print(f"   Total records: {dedup_count:,}")
         print(f"   Unique names: {dedup_unique_names:,}")
@@ -72,7 +85,7 @@ def main():
     
     # Top duplicates in original
     print(f"\n🔍 Top Duplicate Facility Names (Original Dataset):")
-    top_duplicates = df_original['Name'].value_counts().head(10)
+    top_duplicates = original_names.value_counts().head(10)
     for name, count in top_duplicates.items():
         if count > 1:
             print(f"   {count:>3}× {name}")
@@ -3,8 +3,10 @@ Analytics Dashboard Component for Healthcare Facilities
 """
 
 import pandas as pd
+import numpy as np
 import logging
-from typing import Optional, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Hashable, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +20,100 @@ except ImportError:
     logger.warning("Plotly or Streamlit not available. Analytics functionality will be limited.")
     PLOTLY_AVAILABLE = False
 
+# Maximum number of facilities plotted in the coordinate scatter
+GEO_SCATTER_MAX_POINTS = 1000
+
+# Value counts drawn by the analytics charts, as (column, top_k) pairs
+CHART_VALUE_COUNTS = (
+    ('Facility Type', 10),
+    ('Ownership', None),
+    ('State', 15),
+    ('ABDM Enabled', None),
+)
+
+# Worker threads used to compute the chart aggregates
+AGGREGATE_WORKERS = 4
+
+
+def _cache_data(**kwargs):
+    """Apply st.cache_data when Streamlit is available, otherwise leave the function uncached"""
+    if PLOTLY_AVAILABLE:
+        return st.cache_data(**kwargs)
+    return lambda func: func
+
+
+def _top_counts(df: pd.DataFrame, column: str, top_k: Optional[int] = None) -> pd.Series:
+    """Sorted value counts for a column, limited to values present in df"""
+    counts = df[column].value_counts(sort=True)
+    # Category columns also report unobserved categories with a zero count
+    counts = counts[counts > 0]
+    return counts.head(top_k) if top_k else counts
+
+
+def _crosstab(df: pd.DataFrame, index_col: str, columns_col: str) -> pd.DataFrame:
+    """Count matrix of two columns over the value pairs present in df"""
+    # groupby on category codes is much cheaper than pd.crosstab's hashing
+    return (
+        df.groupby([index_col, columns_col], observed=True)
+        .size()
+        .unstack(fill_value=0)
+    )
+
+
+def _compute_aggregates(df: pd.DataFrame) -> Dict[tuple, Any]:
+    """Compute every chart aggregate concurrently, keyed by (column, top_k) or column pair"""
+    jobs = {
+        (column, top_k): (_top_counts, (df, column, top_k))
+        for column, top_k in CHART_VALUE_COUNTS
+        if column in df.columns
+    }
+    if 'Facility Type' in df.columns and 'Ownership' in df.columns:
+        jobs[('Facility Type', 'Ownership')] = (_crosstab, (df, 'Facility Type', 'Ownership'))
+    
+    # The pandas counting/grouping kernels release the GIL, so the
+    # independent aggregations overlap instead of running back to back
+    with ThreadPoolExecutor(max_workers=AGGREGATE_WORKERS) as executor:
+        futures = {key: executor.submit(func, *args) for key, (func, args) in jobs.items()}
+        return {key: future.result() for key, future in futures.items()}
+
+
+@_cache_data(max_entries=32)
+def _cached_aggregates(_df: pd.DataFrame, cache_key: Hashable) -> Dict[tuple, Any]:
+    """Chart aggregates, cached on the caller's filter key"""
+    return _compute_aggregates(_df)
+
+
+def _build_geo_scatter(df: pd.DataFrame) -> Any:
+    """Build the coordinate scatter from an evenly strided, column-trimmed sample"""
+    if len(df) > GEO_SCATTER_MAX_POINTS:
+        # Deterministic stride sample so reruns plot the same points
+        positions = np.linspace(0, len(df) - 1, GEO_SCATTER_MAX_POINTS).astype(int)
+        sample_df = df.iloc[positions]
+    else:
+        sample_df = df
+    
+    # Only the plotted columns are serialized into the figure
+    plot_columns = [c for c in ('Longitude', 'Latitude', 'Facility Type', 'Name') if c in df.columns]
+    sample_df = sample_df[plot_columns]
+    
+    fig = px.scatter(
+        sample_df,
+        x='Longitude',
+        y='Latitude',
+        color='Facility Type' if 'Facility Type' in plot_columns else None,
+        title="Geographic Distribution of Facilities",
+        hover_data=['Name'] if 'Name' in plot_columns else None,
+        render_mode='webgl'
+    )
+    fig.update_layout(height=500)
+    return fig
+
+
+@_cache_data(max_entries=128)
+def _cached_figure(_builder: Callable[[pd.DataFrame], Any], _df: pd.DataFrame, cache_key: Hashable, name: str) -> Any:
+    """Chart figure built by _builder, cached on the caller's filter key and the chart name"""
+    return _builder(_df)
+
 
 class AnalyticsDashboard:
     """Creates analytics visualizations for healthcare facilities data"""
@@ -28,9 +124,20 @@ class AnalyticsDashboard:
             '#3498db', '#e74c3c', '#2ecc71', '#f39c12', 
             '#9b59b6', '#1abc9c', '#e67e22', '#95a5a6'
         ]
+        self.cache_key = None
+        self.aggregates = {}
     
-    def render_analytics(self, df: pd.DataFrame) -> None:
-        """Render comprehensive analytics dashboard"""
+    def render_analytics(self, df: pd.DataFrame, cache_key: Optional[Hashable] = None) -> None:
+        """Render comprehensive analytics dashboard
+        
+        Args:
+            df: Filtered facilities dataframe
+            cache_key: Hashable key identifying df (e.g. the active filter
+                selections); when given, chart aggregates are cached on it
+        """
+        self.cache_key = cache_key
+        self.aggregates = {}
+        
         if not PLOTLY_AVAILABLE:
             st.error("Analytics not available. Please install required packages.")
             return
@@ -40,6 +147,12 @@ class AnalyticsDashboard:
             return
         
         try:
+            # Compute all aggregates up front, before any draw calls
+            if cache_key is None:
+                self.aggregates = _compute_aggregates(df)
+            else:
+                self.aggregates = _cached_aggregates(df, cache_key)
+            
             # Create analytics layout
             col1, col2 = st.columns(2)
             
@@ -59,62 +172,92 @@ class AnalyticsDashboard:
             logger.error(f"Error rendering analytics: {e}")
             st.error(f"Error in analytics: {e}")
     
+    def _top_counts(self, df: pd.DataFrame, column: str, top_k: Optional[int] = None) -> pd.Series:
+        """Top value counts for a column, taken from the precomputed aggregates when available"""
+        counts = self.aggregates.get((column, top_k))
+        return counts if counts is not None else _top_counts(df, column, top_k)
+    
+    def _crosstab(self, df: pd.DataFrame, index_col: str, columns_col: str) -> pd.DataFrame:
+        """Cross-tabulation of two columns, taken from the precomputed aggregates when available"""
+        matrix = self.aggregates.get((index_col, columns_col))
+        return matrix if matrix is not None else _crosstab(df, index_col, columns_col)
+    
+    def _figure(self, name: str, builder: Callable[[pd.DataFrame], Any], df: pd.DataFrame) -> Any:
+        """Build a chart figure, served from cache when a cache key is set
+        
+        Reruns that leave the filters unchanged reuse the figure instead of
+        rebuilding and re-validating every trace.
+        """
+        if self.cache_key is None:
+            return builder(df)
+        return _cached_figure(builder, df, self.cache_key, name)
+    
     def _render_facility_type_chart(self, df: pd.DataFrame) -> None:
         """Render facility type distribution chart"""
         try:
             if 'Facility Type' not in df.columns:
                 return
             
-            facility_counts = df['Facility Type'].value_counts().head(10)
-            
-            fig = px.bar(
-                x=facility_counts.values,
-                y=facility_counts.index,
-                orientation='h',
-                title="Top 10 Facility Types",
-                labels={'x': 'Number of Facilities', 'y': 'Facility Type'},
-                color=facility_counts.values,
-                color_continuous_scale='Blues'
-            )
-            
-            fig.update_layout(
-                height=400,
-                showlegend=False,
-                yaxis={'categoryorder': 'total ascending'}
-            )
-            
+            fig = self._figure('facility_type', self._facility_type_figure, df)
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             logger.error(f"Error creating facility type chart: {e}")
     
+    def _facility_type_figure(self, df: pd.DataFrame) -> Any:
+        """Build the facility type bar chart"""
+        facility_counts = self._top_counts(df, 'Facility Type', 10)
+        
+        # Build the trace directly from arrays; plotly.express would first
+        # assemble a dataframe from the Series before building the figure
+        counts = facility_counts.to_numpy()
+        fig = go.Figure(go.Bar(
+            x=counts,
+            y=facility_counts.index.to_numpy(),
+            orientation='h',
+            marker=dict(color=counts, colorscale='Blues')
+        ))
+        
+        fig.update_layout(
+            title="Top 10 Facility Types",
+            xaxis_title='Number of Facilities',
+            yaxis_title='Facility Type',
+            height=400,
+            showlegend=False,
+            yaxis={'categoryorder': 'total ascending'}
+        )
+        return fig
+    
     def _render_ownership_distribution(self, df: pd.DataFrame) -> None:
         """Render ownership distribution pie chart"""
         try:
             if 'Ownership' not in df.columns:
                 return
             
-            ownership_counts = df['Ownership'].value_counts()
-            
-            fig = px.pie(
-                values=ownership_counts.values,
-                names=ownership_counts.index,
-                title="Facility Ownership Distribution",
-                color_discrete_sequence=self.color_palette
-            )
-            
-            fig.update_traces(
-                textposition='inside',
-                textinfo='percent+label'
-            )
-            
-            fig.update_layout(height=400)
-            
+            fig = self._figure('ownership', self._ownership_figure, df)
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             logger.error(f"Error creating ownership chart: {e}")
     
+    def _ownership_figure(self, df: pd.DataFrame) -> Any:
+        """Build the ownership pie chart"""
+        ownership_counts = self._top_counts(df, 'Ownership')
+        
+        fig = go.Figure(go.Pie(
+            values=ownership_counts.to_numpy(),
+            labels=ownership_counts.index.to_numpy(),
+            marker=dict(colors=self.color_palette),
+            textposition='inside',
+            textinfo='percent+label'
+        ))
+        
+        fig.update_layout(
+            title="Facility Ownership Distribution",
+            height=400
+        )
+        return fig
+    
     def _render_state_distribution(self, df: pd.DataFrame) -> None:
         """Render state-wise facility distribution"""
         try:
@@ -136,28 +279,33 @@ class AnalyticsDashboard:
                 st.plotly_chart(fig, use_container_width=True)
                 return
             
-            state_counts = df['State'].value_counts().head(15)
-            
-            fig = px.bar(
-                x=state_counts.index,
-                y=state_counts.values,
-                title="Top 15 States by Facility Count",
-                labels={'x': 'State', 'y': 'Number of Facilities'},
-                color=state_counts.values,
-                color_continuous_scale='Greens'
-            )
-            
-            fig.update_layout(
-                height=400,
-                xaxis_tickangle=-45,
-                showlegend=False
-            )
-            
+            fig = self._figure('state', self._state_figure, df)
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             logger.error(f"Error creating state distribution chart: {e}")
     
+    def _state_figure(self, df: pd.DataFrame) -> Any:
+        """Build the top states bar chart"""
+        state_counts = self._top_counts(df, 'State', 15)
+        
+        counts = state_counts.to_numpy()
+        fig = go.Figure(go.Bar(
+            x=state_counts.index.to_numpy(),
+            y=counts,
+            marker=dict(color=counts, colorscale='Greens')
+        ))
+        
+        fig.update_layout(
+            title="Top 15 States by Facility Count",
+            xaxis_title='State',
+            yaxis_title='Number of Facilities',
+            height=400,
+            xaxis_tickangle=-45,
+            showlegend=False
+        )
+        return fig
+    
     def _render_abdm_analysis(self, df: pd.DataFrame) -> None:
         """Render ABDM enablement analysis"""
         try:
@@ -179,64 +327,66 @@ class AnalyticsDashboard:
                 st.plotly_chart(fig, use_container_width=True)
                 return
             
-            abdm_counts = df['ABDM Enabled'].value_counts()
-            
-            colors = ['#e74c3c' if x.lower() == 'no' else '#2ecc71' for x in abdm_counts.index]
-            
-            fig = px.bar(
-                x=abdm_counts.index,
-                y=abdm_counts.values,
-                title="ABDM Enablement Status",
-                labels={'x': 'ABDM Status', 'y': 'Number of Facilities'},
-                color=abdm_counts.index,
-                color_discrete_map={'Yes': '#2ecc71', 'No': '#e74c3c'}
-            )
-            
-            fig.update_layout(
-                height=400,
-                showlegend=False
-            )
-            
+            fig = self._figure('abdm', self._abdm_figure, df)
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             logger.error(f"Error creating ABDM chart: {e}")
     
+    def _abdm_figure(self, df: pd.DataFrame) -> Any:
+        """Build the ABDM enablement bar chart"""
+        abdm_counts = self._top_counts(df, 'ABDM Enabled')
+        
+        colors = ['#e74c3c' if x.lower() == 'no' else '#2ecc71' for x in abdm_counts.index]
+        
+        fig = go.Figure(go.Bar(
+            x=abdm_counts.index.to_numpy(),
+            y=abdm_counts.to_numpy(),
+            marker_color=colors
+        ))
+        
+        fig.update_layout(
+            title="ABDM Enablement Status",
+            xaxis_title='ABDM Status',
+            yaxis_title='Number of Facilities',
+            height=400,
+            showlegend=False
+        )
+        return fig
+    
     def _render_facility_ownership_matrix(self, df: pd.DataFrame) -> None:
         """Render facility type vs ownership matrix"""
         try:
             if 'Facility Type' not in df.columns or 'Ownership' not in df.columns:
                 return
             
-            # Create cross-tabulation
-            matrix = pd.crosstab(df['Facility Type'], df['Ownership'])
-            
-            fig = px.imshow(
-                matrix.values,
-                x=matrix.columns,
-                y=matrix.index,
-                color_continuous_scale='Blues',
-                title="Facility Type vs Ownership Matrix",
-                labels=dict(color="Count")
-            )
-            
-            # Add text annotations
-            for i in range(len(matrix.index)):
-                for j in range(len(matrix.columns)):
-                    fig.add_annotation(
-                        x=j, y=i,
-                        text=str(matrix.iloc[i, j]),
-                        showarrow=False,
-                        font=dict(color="white" if matrix.iloc[i, j] > matrix.values.max()/2 else "black")
-                    )
-            
-            fig.update_layout(height=500)
-            
+            fig = self._figure('ownership_matrix', self._ownership_matrix_figure, df)
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             logger.error(f"Error creating facility-ownership matrix: {e}")
     
+    def _ownership_matrix_figure(self, df: pd.DataFrame) -> Any:
+        """Build the facility type vs ownership heatmap"""
+        # Create cross-tabulation
+        matrix = self._crosstab(df, 'Facility Type', 'Ownership')
+        
+        # Cell counts are drawn by the heatmap trace itself (with automatic
+        # text contrast) instead of one layout annotation per cell
+        fig = px.imshow(
+            matrix.values,
+            x=matrix.columns,
+            y=matrix.index,
+            color_continuous_scale='Blues',
+            title="Facility Type vs Ownership Matrix",
+            labels=dict(color="Count"),
+            text_auto=True,
+            aspect='auto'
+        )
+        
+        fig.update_layout(height=500)
+        return fig
+    
     def _render_geographic_analysis(self, df: pd.DataFrame) -> None:
         """Render geographic analysis if coordinate data is available"""
         try:
@@ -249,58 +399,44 @@ class AnalyticsDashboard:
             
             with col1:
                 # Latitude distribution
-                fig = px.histogram(
-                    df,
-                    x='Latitude',
-                    nbins=30,
-                    title="Latitude Distribution",
-                    labels={'x': 'Latitude', 'y': 'Frequency'}
-                )
-                fig.update_layout(height=300)
+                fig = self._figure('latitude_histogram', self._latitude_histogram_figure, df)
                 st.plotly_chart(fig, use_container_width=True)
             
             with col2:
                 # Longitude distribution
-                fig = px.histogram(
-                    df,
-                    x='Longitude',
-                    nbins=30,
-                    title="Longitude Distribution",
-                    labels={'x': 'Longitude', 'y': 'Frequency'}
-                )
-                fig.update_layout(height=300)
+                fig = self._figure('longitude_histogram', self._longitude_histogram_figure, df)
                 st.plotly_chart(fig, use_container_width=True)
             
             # Coordinate scatter plot (sample for performance)
-            if len(df) > 1000:
-                sample_df = df.sample(1000)
-                st.info("Showing 1000 random facilities for coordinate analysis")
-            else:
-                sample_df = df
+            if len(df) > GEO_SCATTER_MAX_POINTS:
+                st.info(f"Showing {GEO_SCATTER_MAX_POINTS} evenly sampled facilities for coordinate analysis")
             
-            if 'Facility Type' in df.columns:
-                fig = px.scatter(
-                    sample_df,
-                    x='Longitude',
-                    y='Latitude',
-                    color='Facility Type',
-                    title="Geographic Distribution of Facilities",
-                    hover_data=['Name'] if 'Name' in df.columns else None
-                )
-            else:
-                fig = px.scatter(
-                    sample_df,
-                    x='Longitude',
-                    y='Latitude',
-                    title="Geographic Distribution of Facilities"
-                )
-            
-            fig.update_layout(height=500)
+            fig = self._figure('geo_scatter', _build_geo_scatter, df)
             st.plotly_chart(fig, use_container_width=True)
             
         except Exception as e:
             logger.error(f"Error creating geographic analysis: {e}")
     
+    @staticmethod
+    def _histogram_figure(df: pd.DataFrame, column: str) -> Any:
+        """Build a 30-bin histogram of a coordinate column"""
+        fig = go.Figure(go.Histogram(x=df[column].to_numpy(), nbinsx=30))
+        fig.update_layout(
+            title=f"{column} Distribution",
+            xaxis_title=column,
+            yaxis_title='Frequency',
+            height=300
+        )
+        return fig
+    
+    def _latitude_histogram_figure(self, df: pd.DataFrame) -> Any:
+        """Build the latitude histogram"""
+        return self._histogram_figure(df, 'Latitude')
+    
+    def _longitude_histogram_figure(self, df: pd.DataFrame) -> Any:
+        """Build the longitude histogram"""
+        return self._histogram_figure(df, 'Longitude')
+    
     def generate_summary_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Generate summary statistics for the dataset"""
         try:
@@ -316,15 +452,15 @@ class AnalyticsDashboard:
             
             # Add facility type breakdown
             if 'Facility Type' in df.columns:
-                stats['facility_type_breakdown'] = df['Facility Type'].value_counts().to_dict()
+                stats['facility_type_breakdown'] = _top_counts(df, 'Facility Type').to_dict()
             
             # Add ownership breakdown
             if 'Ownership' in df.columns:
-                stats['ownership_breakdown'] = df['Ownership'].value_counts().to_dict()
+                stats['ownership_breakdown'] = _top_counts(df, 'Ownership').to_dict()
             
             # Add ABDM stats
             if 'ABDM Enabled' in df.columns:
-                stats['abdm_stats'] = df['ABDM Enabled'].value_counts().to_dict()
+                stats['abdm_stats'] = _top_counts(df, 'ABDM Enabled').to_dict()
             
             return stats
             
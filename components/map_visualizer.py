@@ -3,8 +3,9 @@ Map Visualization Component for Healthcare Facilities
 """
 
 import pandas as pd
+import numpy as np
 import logging
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +17,80 @@ except ImportError:
     logger.warning("Folium not available. Map functionality will be limited.")
     MAP_AVAILABLE = False
 
+# Decimal places kept when coordinates are serialized into the map (~1 m)
+COORDINATE_DECIMALS = 5
+
+
+# Facility popup template: name, type, ownership, address, address ellipsis,
+# optional state block, optional ABDM block, latitude, longitude
+POPUP_HTML = """
+        <div style="font-family: Arial, sans-serif; width: 250px;">
+            <h4 style="margin-bottom: 10px; color: #2c3e50;">
+                %s
+            </h4>
+            
+            <div style="margin-bottom: 8px;">
+                <strong>Type:</strong> %s
+            </div>
+            
+            <div style="margin-bottom: 8px;">
+                <strong>Ownership:</strong> %s
+            </div>
+            
+            <div style="margin-bottom: 8px;">
+                <strong>Address:</strong> %s
+                %s
+            </div>
+        %s%s
+            <div style="margin-top: 10px; font-size: 11px; color: #7f8c8d;">
+                📍 %.4f, %.4f
+            </div>
+        </div>
+        """
+
+POPUP_STATE_HTML = """
+            <div style="margin-bottom: 8px;">
+                <strong>State:</strong> %s
+            </div>
+            """
+
+POPUP_ABDM_HTML = """
+            <div style="margin-bottom: 8px;">
+                <strong>ABDM:</strong> 
+                <span style="color: %s; font-weight: bold;">
+                    %s
+                </span>
+            </div>
+            """
+
+
+# Builds each clustered marker in the browser from [lat, lon, popup, tooltip]
+CLUSTER_MARKER_CALLBACK = """function (row) {
+    var icon = L.AwesomeMarkers.icon({icon: 'plus', prefix: 'fa', markerColor: 'blue'});
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {icon: icon});
+    marker.bindPopup(row[2], {maxWidth: 300});
+    marker.bindTooltip(row[3]);
+    return marker;
+}"""
+
+
+def _tooltip_text(name: Any) -> str:
+    """Marker tooltip for a facility name, with a default for missing names"""
+    return str(name) if pd.notna(name) else 'Healthcare Facility'
+
+
+def _coordinate_lists(df: pd.DataFrame) -> Tuple[List[float], List[float]]:
+    """Latitudes and longitudes as plain floats, rounded for serialization"""
+    # Only the serialized copy is rounded; the frame keeps full precision
+    latitudes = df['Latitude'].to_numpy(dtype=np.float64).round(COORDINATE_DECIMALS)
+    longitudes = df['Longitude'].to_numpy(dtype=np.float64).round(COORDINATE_DECIMALS)
+    return latitudes.tolist(), longitudes.tolist()
+
+
+def _name_list(df: pd.DataFrame) -> List[Any]:
+    """Facility names in row order, or None for every row without a Name column"""
+    return df['Name'].tolist() if 'Name' in df.columns else [None] * len(df)
+
 
 class MapVisualizer:
     """Creates interactive maps for healthcare facilities"""
@@ -38,13 +113,30 @@ class MapVisualizer:
             'PPP': '#f39c12',  # Orange
             'Default': '#7f8c8d'  # Gray
         }
+        
+        # The color mappings are fixed, so each legend is rendered once
+        self.legend_html = {
+            'facility_type': self._render_legend(self.facility_colors, "Facility Types"),
+            'ownership': self._render_legend(self.ownership_colors, "Ownership Types")
+        }
     
-    def create_facility_map(self, df: pd.DataFrame, color_by: str = 'facility_type') -> Optional[Any]:
-        """Create an interactive map of healthcare facilities"""
+    def create_facility_map(self, df: pd.DataFrame, color_by: str = 'facility_type',
+                            viewport: Optional[Tuple[float, float, float, float]] = None) -> Optional[Any]:
+        """Create an interactive map of healthcare facilities
+        
+        Args:
+            df: Facilities to plot
+            color_by: 'facility_type' or 'ownership'
+            viewport: Optional (south, west, north, east) bounds; facilities
+                outside it are dropped before sampling and marker creation
+        """
         if not MAP_AVAILABLE:
             logger.error("Folium not available for map creation")
             return None
         
+        if viewport is not None:
+            df = self._filter_to_viewport(df, viewport)
+        
         if df.empty:
             logger.warning("No data provided for map creation")
             return None
@@ -53,9 +145,13 @@ class MapVisualizer:
             # Sample data if too large for performance
             df_map = self._sample_data_for_map(df)
             
+            # Coordinates are extracted once and reused for the center and both layers
+            coordinates = _coordinate_lists(df_map)
+            latitudes, longitudes = coordinates
+            
             # Calculate map center
-            center_lat = df_map['Latitude'].mean()
-            center_lon = df_map['Longitude'].mean()
+            center_lat = sum(latitudes) / len(latitudes)
+            center_lon = sum(longitudes) / len(longitudes)
             
             # Create base map
             m = folium.Map(
@@ -65,19 +161,25 @@ class MapVisualizer:
                 control_scale=True
             )
             
+            if viewport is not None:
+                south, west, north, east = viewport
+                m.fit_bounds([[south, west], [north, east]])
+            
             # Add different tile layers
             folium.TileLayer('CartoDB positron', name='CartoDB Positron').add_to(m)
             folium.TileLayer('CartoDB dark_matter', name='CartoDB Dark').add_to(m)
             
-            # Add markers
-            self._add_markers(m, df_map, color_by)
+            # Add markers (popups are shared by the marker and cluster layers)
+            popups = self._create_popup_contents(df_map)
+            colors = self._marker_colors(df_map, color_by)
+            self._add_markers(m, df_map, color_by, popups, colors, coordinates)
             
             # Add layer control
             folium.LayerControl().add_to(m)
             
             # Add marker clusters for better performance
             if len(df_map) > 100:
-                self._add_cluster_map(m, df_map, color_by)
+                self._add_cluster_map(m, df_map, color_by, popups, coordinates)
             
             # Add legend
             self._add_legend(m, color_by)
@@ -89,154 +191,173 @@ class MapVisualizer:
             logger.error(f"Error creating map: {e}")
             return None
     
+    @staticmethod
+    def _filter_to_viewport(df: pd.DataFrame, viewport: Tuple[float, float, float, float]) -> pd.DataFrame:
+        """Keep only facilities inside the (south, west, north, east) bounds"""
+        south, west, north, east = viewport
+        # Compared in the column's own dtype, without a converted copy
+        latitude = df['Latitude'].to_numpy()
+        longitude = df['Longitude'].to_numpy()
+        inside = (latitude >= south) & (latitude <= north) & (longitude >= west) & (longitude <= east)
+        return df if inside.all() else df[inside]
+    
     def _sample_data_for_map(self, df: pd.DataFrame, max_points: int = 2000) -> pd.DataFrame:
         """Sample data for map performance if dataset is too large"""
         if len(df) <= max_points:
             return df
         
         # Sample strategically - try to get representation from different facility types
-        sampled_dfs = []
-        
         if 'Facility Type' in df.columns:
-            facility_types = df['Facility Type'].unique()
-            points_per_type = max(1, max_points // len(facility_types))
+            facility_types = df['Facility Type'].reset_index(drop=True)
+            points_per_type = max(1, max_points // facility_types.nunique(dropna=False))
             
-            for facility_type in facility_types:
-                type_df = df[df['Facility Type'] == facility_type]
-                if len(type_df) > points_per_type:
-                    sampled_dfs.append(type_df.sample(points_per_type))
-                else:
-                    sampled_dfs.append(type_df)
+            # Shuffle only the key column, then keep the first points_per_type
+            # positions of each type in one grouping pass
+            shuffled = facility_types.sample(frac=1)
+            picked = shuffled.groupby(shuffled, observed=True, sort=False).head(points_per_type)
             
-            result = pd.concat(sampled_dfs, ignore_index=True)
+            result = df.iloc[picked.index].reset_index(drop=True)
         else:
             result = df.sample(max_points)
         
         logger.info(f"Sampled {len(result)} facilities from {len(df)} for map display")
         return result
     
-    def _add_markers(self, map_obj: Any, df: pd.DataFrame, color_by: str) -> None:
-        """Add individual markers to the map"""
-        color_mapping = self.facility_colors if color_by == 'facility_type' else self.ownership_colors
+    def _marker_colors(self, df: pd.DataFrame, color_by: str) -> np.ndarray:
+        """Marker fill color for every facility, with the default for unmapped values"""
+        if color_by == 'facility_type':
+            color_mapping, field = self.facility_colors, 'Facility Type'
+        else:
+            color_mapping, field = self.ownership_colors, 'Ownership'
         
-        for idx, row in df.iterrows():
-            # Determine marker color
-            if color_by == 'facility_type':
-                color_key = row.get('Facility Type', 'Default')
-            else:
-                color_key = row.get('Ownership', 'Default')
-            
-            color = color_mapping.get(color_key, color_mapping['Default'])
-            
-            # Create popup content
-            popup_html = self._create_popup_content(row)
-            
-            # Create marker
-            folium.CircleMarker(
-                location=[row['Latitude'], row['Longitude']],
-                radius=6,
-                popup=folium.Popup(popup_html, max_width=300),
-                tooltip=row.get('Name', 'Healthcare Facility'),
-                color='white',
-                fillColor=color,
-                fillOpacity=0.8,
-                weight=1
-            ).add_to(map_obj)
+        if field not in df.columns:
+            return np.full(len(df), color_mapping['Default'], dtype=object)
+        
+        # One lookup per distinct value instead of one per row
+        mapped = df[field].map(color_mapping).to_numpy(dtype=object, na_value=None)
+        return np.where(pd.isna(mapped), color_mapping['Default'], mapped)
     
-    def _add_cluster_map(self, map_obj: Any, df: pd.DataFrame, color_by: str) -> None:
+    def _add_markers(self, map_obj: Any, df: pd.DataFrame, color_by: str,
+                     popups: Optional[List[str]] = None,
+                     colors: Optional[np.ndarray] = None,
+                     coordinates: Optional[Tuple[List[float], List[float]]] = None) -> None:
+        """Add individual markers to the map as a single GeoJSON layer"""
+        if popups is None:
+            popups = self._create_popup_contents(df)
+        
+        if colors is None:
+            colors = self._marker_colors(df, color_by)
+        
+        latitudes, longitudes = coordinates if coordinates is not None else _coordinate_lists(df)
+        names = _name_list(df)
+        
+        features = []
+        for name, popup_html, color, lat, lon in zip(names, popups, colors.tolist(), latitudes, longitudes):
+            features.append({
+                'type': 'Feature',
+                # GeoJSON positions are [longitude, latitude]
+                'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+                'properties': {
+                    'name': _tooltip_text(name),
+                    'popup': popup_html,
+                    'color': color
+                }
+            })
+        
+        # One layer serialized as JSON replaces a templated CircleMarker per facility
+        folium.GeoJson(
+            {'type': 'FeatureCollection', 'features': features},
+            name='Facilities',
+            control=False,
+            marker=folium.CircleMarker(radius=6, color='white', fill=True, fill_opacity=0.8, weight=1),
+            style_function=lambda feature: {'fillColor': feature['properties']['color']},
+            popup=folium.GeoJsonPopup(fields=['popup'], labels=False, max_width=300),
+            tooltip=folium.GeoJsonTooltip(fields=['name'], labels=False)
+        ).add_to(map_obj)
+    
+    def _add_cluster_map(self, map_obj: Any, df: pd.DataFrame, color_by: str,
+                         popups: Optional[List[str]] = None,
+                         coordinates: Optional[Tuple[List[float], List[float]]] = None) -> None:
         """Add clustered markers for better performance with large datasets"""
-        # Create marker cluster
-        marker_cluster = plugins.MarkerCluster(
+        if popups is None:
+            popups = self._create_popup_contents(df)
+        
+        latitudes, longitudes = coordinates if coordinates is not None else _coordinate_lists(df)
+        names = _name_list(df)
+        
+        # Markers are created in the browser from one data array
+        data = [
+            [lat, lon, popup_html, _tooltip_text(name)]
+            for lat, lon, popup_html, name in zip(latitudes, longitudes, popups, names)
+        ]
+        
+        plugins.FastMarkerCluster(
+            data,
+            callback=CLUSTER_MARKER_CALLBACK,
             name='Clustered Facilities',
             overlay=True,
             control=True
-        )
-        
-        color_mapping = self.facility_colors if color_by == 'facility_type' else self.ownership_colors
+        ).add_to(map_obj)
+    
+    def _create_popup_contents(self, df: pd.DataFrame) -> List[str]:
+        """Create HTML popup content for every facility"""
+        # Missing values, truncation and the optional blocks are resolved
+        # column-wise; rows are then filled into the template in one pass
+        def column(name: str, default: str) -> List[str]:
+            if name not in df.columns:
+                return [default] * len(df)
+            values = df[name]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Stringify each category once; code -1 (missing) takes the default
+                labels = values.cat.categories.astype(str).tolist() + [default]
+                return np.array(labels, dtype=object)[values.cat.codes.to_numpy()].tolist()
+            return values.astype(object).where(values.notna(), default).astype(str).tolist()
         
-        for idx, row in df.iterrows():
-            # Determine marker color
-            if color_by == 'facility_type':
-                color_key = row.get('Facility Type', 'Default')
-            else:
-                color_key = row.get('Ownership', 'Default')
-            
-            color = color_mapping.get(color_key, color_mapping['Default'])
-            
-            # Create popup content
-            popup_html = self._create_popup_content(row)
-            
-            # Add marker to cluster
-            folium.Marker(
-                location=[row['Latitude'], row['Longitude']],
-                popup=folium.Popup(popup_html, max_width=300),
-                tooltip=row.get('Name', 'Healthcare Facility'),
-                icon=folium.Icon(color='blue', icon='plus', prefix='fa')
-            ).add_to(marker_cluster)
+        def optional_blocks(name: str, render: Callable[[str], str]) -> List[str]:
+            """Rendered block per row for a column, or '' where it is missing"""
+            if name not in df.columns:
+                return [''] * len(df)
+            values = df[name]
+            if isinstance(values.dtype, pd.CategoricalDtype):
+                # Render once per category and broadcast through the codes;
+                # code -1 (missing) indexes the trailing empty block
+                blocks = [render(str(category)) for category in values.cat.categories] + ['']
+                return np.array(blocks, dtype=object)[values.cat.codes.to_numpy()].tolist()
+            return [
+                render(value) if present else ''
+                for value, present in zip(values.astype(str).tolist(), values.notna().tolist())
+            ]
         
-        marker_cluster.add_to(map_obj)
-    
-    def _create_popup_content(self, row: pd.Series) -> str:
-        """Create HTML content for facility popup"""
-        html = f"""
-        <div style="font-family: Arial, sans-serif; width: 250px;">
-            <h4 style="margin-bottom: 10px; color: #2c3e50;">
-                {row.get('Name', 'Healthcare Facility')}
-            </h4>
-            
-            <div style="margin-bottom: 8px;">
-                <strong>Type:</strong> {row.get('Facility Type', 'N/A')}
-            </div>
-            
-            <div style="margin-bottom: 8px;">
-                <strong>Ownership:</strong> {row.get('Ownership', 'N/A')}
-            </div>
-            
-            <div style="margin-bottom: 8px;">
-                <strong>Address:</strong> {str(row.get('Address', 'N/A'))[:100]}
-                {'...' if len(str(row.get('Address', ''))) > 100 else ''}
-            </div>
-        """
+        address = column('Address', 'N/A')
         
         # Add state if available
-        if 'State' in row and pd.notna(row['State']):
-            html += f"""
-            <div style="margin-bottom: 8px;">
-                <strong>State:</strong> {row['State']}
-            </div>
-            """
+        state_blocks = optional_blocks('State', lambda state: POPUP_STATE_HTML % state)
         
         # Add ABDM status if available
-        if 'ABDM Enabled' in row and pd.notna(row['ABDM Enabled']):
-            abdm_color = '#27ae60' if str(row['ABDM Enabled']).lower() == 'yes' else '#e74c3c'
-            html += f"""
-            <div style="margin-bottom: 8px;">
-                <strong>ABDM:</strong> 
-                <span style="color: {abdm_color}; font-weight: bold;">
-                    {row['ABDM Enabled']}
-                </span>
-            </div>
-            """
-        
-        # Add coordinates
-        html += f"""
-            <div style="margin-top: 10px; font-size: 11px; color: #7f8c8d;">
-                📍 {row['Latitude']:.4f}, {row['Longitude']:.4f}
-            </div>
-        </div>
-        """
+        abdm_blocks = optional_blocks('ABDM Enabled', lambda abdm: POPUP_ABDM_HTML % (
+            '#27ae60' if abdm.lower() == 'yes' else '#e74c3c', abdm
+        ))
         
-        return html
+        return [
+            POPUP_HTML % (
+                name, facility_type, ownership, addr[:100], '...' if len(addr) > 100 else '',
+                state_block, abdm_block, lat, lon
+            )
+            for name, facility_type, ownership, addr, state_block, abdm_block, lat, lon in zip(
+                column('Name', 'Healthcare Facility'),
+                column('Facility Type', 'N/A'),
+                column('Ownership', 'N/A'),
+                address,
+                state_blocks,
+                abdm_blocks,
+                df['Latitude'].tolist(),
+                df['Longitude'].tolist()
+            )
+        ]
     
-    def _add_legend(self, map_obj: Any, color_by: str) -> None:
-        """Add a legend to the map"""
-        if color_by == 'facility_type':
-            legend_items = self.facility_colors
-            title = "Facility Types"
-        else:
-            legend_items = self.ownership_colors
-            title = "Ownership Types"
-        
+    @staticmethod
+    def _render_legend(legend_items: Dict[str, str], title: str) -> str:
+        """Render the legend HTML for a color mapping"""
         legend_html = f"""
         <div style="position: fixed; 
                     bottom: 50px; left: 50px; width: 200px; height: auto; 
@@ -258,7 +379,11 @@ class MapVisualizer:
                 """
         
         legend_html += "</div>"
-        
+        return legend_html
+    
+    def _add_legend(self, map_obj: Any, color_by: str) -> None:
+        """Add a legend to the map"""
+        legend_html = self.legend_html['facility_type' if color_by == 'facility_type' else 'ownership']
         map_obj.get_root().html.add_child(folium.Element(legend_html))
     
     def create_heatmap(self, df: pd.DataFrame) -> Optional[Any]:
@@ -279,7 +404,10 @@ class MapVisualizer:
             )
             
             # Prepare data for heatmap
-            heat_data = [[row['Latitude'], row['Longitude']] for idx, row in df.iterrows()]
+            heat_data = (
+                df[['Latitude', 'Longitude']].dropna()
+                .to_numpy(dtype=np.float64).round(COORDINATE_DECIMALS).tolist()
+            )
             
             # Add heatmap layer
             plugins.HeatMap(heat_data, radius=15, blur=10).add_to(m)
@@ -5,35 +5,128 @@ Natural Language Search Engine for Healthcare Facilities
 import pandas as pd
 import numpy as np
 import logging
-from typing import Optional, List, Dict, Any
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Tuple
 import re
 
 logger = logging.getLogger(__name__)
 
 try:
-    from sentence_transformers import SentenceTransformer
     import faiss
-    SEARCH_AVAILABLE = True
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SEARCH_AVAILABLE = FAISS_AVAILABLE
 except ImportError:
-    logger.warning("sentence-transformers or faiss not available. Search functionality will be limited.")
     SEARCH_AVAILABLE = False
+if not SEARCH_AVAILABLE:
+    logger.warning("sentence-transformers or faiss not available. Search functionality will be limited.")
+
+try:
+    from model2vec import StaticModel
+    STATIC_EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    STATIC_EMBEDDINGS_AVAILABLE = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Static (lookup-table) embedding model: no attention layers, so encoding the
+# corpus and each query is cheap enough to run on CPU in-process
+STATIC_MODEL_NAME = 'minishlab/potion-base-8M'
+
+# Directory where corpus embeddings are persisted between app starts
+EMBEDDINGS_CACHE_DIR = Path(__file__).parent.parent / "data"
+
+# Columns that feed the search texts (in order), and so the embeddings cache key
+SEARCH_TEXT_COLUMNS = ['Name', 'Facility Type', 'Ownership', 'Address', 'State', 'Specialties', 'ABDM Enabled']
+
+# Columns scanned by the text fallback search
+FALLBACK_SEARCH_COLUMNS = ['Name', 'Facility Type', 'Ownership', 'Address']
+
+# Labels prepended to a column's value in the search text
+SEARCH_TEXT_PREFIXES = {'ABDM Enabled': 'ABDM '}
+
+# HNSW graph parameters for the static embedding index: neighbours per node,
+# and candidate list sizes while building and while searching
+HNSW_NEIGHBORS = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+# Minimum cosine similarity for a semantic match to be returned
+RELEVANCE_THRESHOLD = 0.2
+
+
+def _column_contains(column: pd.Series, *terms: str, lowered: Optional[pd.Series] = None) -> np.ndarray:
+    """Case-insensitive literal substring match of any of terms against a column
+    
+    The terms are combined into one escaped alternation so each column is
+    scanned once. Category columns are matched once per distinct category and
+    the result is broadcast through the codes, instead of lowercasing and
+    scanning every row. For other columns, lowered may supply the column's
+    precomputed lowercase text. Missing values never match.
+    """
+    if not terms:
+        return np.zeros(len(column), dtype=bool)
+    pattern = '|'.join(re.escape(term) for term in terms)
+    
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        categories = column.cat.categories.astype(str).str.lower()
+        hits = np.asarray(categories.str.contains(pattern, regex=True), dtype=bool)
+        # Code -1 (missing) indexes the trailing False
+        return np.append(hits, False)[column.cat.codes.to_numpy()]
+    
+    if lowered is None:
+        lowered = column.astype(str).str.lower()
+    return lowered.str.contains(pattern, na=False, regex=True).to_numpy(dtype=bool)
 
 
 class SearchEngine:
     """Natural language search engine for healthcare facilities"""
     
-    def __init__(self, model_name: str = 'all-MiniLM-L6-v2'):
+    def __init__(self, model_name: str = 'all-MiniLM-L6-v2', static_model_name: str = STATIC_MODEL_NAME,
+                 cache_dir: Optional[Path] = EMBEDDINGS_CACHE_DIR):
         """Initialize the search engine"""
         self.model = None
         self.index = None
         self.search_texts = []
         self.model_name = model_name
+        self.static_model_name = static_model_name
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.static_model = None
+        self.embeddings = None
+        self.static_index = None
+        self.lowercase_columns = {}
+        self.lowercase_index = None
+        self.suggestion_terms = None
+        self.token_vocabulary = None
+        self.token_offsets = None
+        self.token_rows = None
+        self.token_index_columns = ()
         self.initialized = False
         
     def initialize(self, df: pd.DataFrame) -> bool:
         """Initialize the search engine with facility data"""
         try:
-            # Always use fallback search to avoid segmentation faults
+            self._cache_lowercase_columns(df)
+            self.suggestion_terms = self._build_suggestion_terms(df)
+            if ARROW_AVAILABLE:
+                self._build_token_index()
+            
+            if STATIC_EMBEDDINGS_AVAILABLE:
+                self._initialize_static_embeddings(df)
+            
+            # Transformer search stays off to avoid segmentation faults; text
+            # search is used whenever static embeddings are not available
             logger.info("Initializing text-based search engine for stability...")
             self.initialized = True
             return True
@@ -73,45 +166,243 @@ class SearchEngine:
             self.initialized = True
             return True
     
-    def _create_search_texts(self, df: pd.DataFrame) -> List[str]:
-        """Create searchable text representations of facilities"""
-        search_texts = []
+    def _cache_lowercase_columns(self, df: pd.DataFrame) -> None:
+        """Lowercase the free-text search columns once instead of on every query"""
+        # Category columns are already matched per category, so only
+        # row-level text columns are worth keeping
+        self.lowercase_columns = {
+            column: df[column].astype(str).str.lower()
+            for column in FALLBACK_SEARCH_COLUMNS
+            if column in df.columns and not isinstance(df[column].dtype, pd.CategoricalDtype)
+        }
+        self.lowercase_index = df.index
+    
+    def _lowercase_column(self, df: pd.DataFrame, column: str) -> Optional[pd.Series]:
+        """Cached lowercase text of a column, if df is the frame the cache was built from"""
+        lowered = self.lowercase_columns.get(column)
+        # Streamlit hands out copies of the cached dataset, so compare the
+        # index rather than object identity
+        if lowered is None or not df.index.equals(self.lowercase_index):
+            return None
+        return lowered
+    
+    def _build_token_index(self) -> None:
+        """Build an inverted index from whitespace-delimited tokens to the rows containing them
         
-        for _, row in df.iterrows():
-            text_parts = []
-            
-            # Add facility name
-            if pd.notna(row.get('Name')):
-                text_parts.append(str(row['Name']))
-            
-            # Add facility type
-            if pd.notna(row.get('Facility Type')):
-                text_parts.append(str(row['Facility Type']))
+        A query term never contains whitespace, so it is a substring of a row's
+        text exactly when it is a substring of one of that row's tokens. Matching
+        terms against the much smaller token vocabulary and expanding the hits
+        through the postings gives the same rows as scanning every row's text.
+        """
+        try:
+            tokens, rows = [], []
+            for lowered in self.lowercase_columns.values():
+                token_lists = pc.utf8_split_whitespace(pa.array(lowered, from_pandas=True))
+                tokens.append(pc.list_flatten(token_lists))
+                rows.append(pc.list_parent_indices(token_lists).to_numpy())
             
-            # Add ownership
-            if pd.notna(row.get('Ownership')):
-                text_parts.append(str(row['Ownership']))
+            if not tokens:
+                return
             
-            # Add address
-            if pd.notna(row.get('Address')):
-                text_parts.append(str(row['Address']))
+            encoded = pc.dictionary_encode(pa.chunked_array(tokens)).combine_chunks()
+            codes = encoded.indices.to_numpy()
+            rows = np.concatenate(rows)
             
-            # Add state if available
-            if pd.notna(row.get('State')):
-                text_parts.append(str(row['State']))
+            # CSR layout: rows of token i are token_rows[token_offsets[i]:token_offsets[i + 1]]
+            order = np.argsort(codes, kind='stable')
+            self.token_rows = rows[order]
+            self.token_offsets = np.concatenate(
+                ([0], np.cumsum(np.bincount(codes, minlength=len(encoded.dictionary))))
+            )
+            self.token_vocabulary = encoded.dictionary
+            self.token_index_columns = tuple(self.lowercase_columns)
+            logger.info(f"Token index built with {len(self.token_vocabulary):,} distinct tokens")
+        except Exception as e:
+            logger.error(f"Error building token index: {e}")
+            self.token_vocabulary = None
+            self.token_index_columns = ()
+    
+    def _token_indexed_columns(self, df: pd.DataFrame) -> tuple:
+        """Columns the token index can answer for df, empty if df is not the indexed frame"""
+        if self.token_vocabulary is None or not df.index.equals(self.lowercase_index):
+            return ()
+        return self.token_index_columns
+    
+    def _token_index_contains(self, terms: List[str]) -> np.ndarray:
+        """Row mask of indexed rows whose text contains any of terms"""
+        mask = np.zeros(len(self.lowercase_index), dtype=bool)
+        if not terms:
+            return mask
+        
+        pattern = '|'.join(re.escape(term) for term in terms)
+        hits = np.flatnonzero(pc.match_substring_regex(self.token_vocabulary, pattern).to_numpy(zero_copy_only=False))
+        if len(hits) == 0:
+            return mask
+        
+        # Gather the postings of every matching token in one vectorized step
+        starts = self.token_offsets[hits]
+        lengths = self.token_offsets[hits + 1] - starts
+        segment_starts = np.cumsum(lengths) - lengths
+        positions = np.repeat(starts - segment_starts, lengths) + np.arange(lengths.sum())
+        mask[self.token_rows[positions]] = True
+        return mask
+    
+    def _initialize_static_embeddings(self, df: pd.DataFrame) -> None:
+        """Embed the facility corpus once with the static embedding model"""
+        try:
+            self.static_model = StaticModel.from_pretrained(self.static_model_name)
             
-            # Add specialties if available
-            if pd.notna(row.get('Specialties')):
-                text_parts.append(str(row['Specialties']))
+            cache_path = self._embeddings_cache_path(df)
+            if cache_path is not None and cache_path.exists():
+                # Memory-mapped: pages are read on demand instead of up front
+                self.embeddings = np.load(cache_path, mmap_mode='r')
+                logger.info(f"Loaded static embeddings from: {cache_path}")
+            else:
+                logger.info(f"Building static embeddings with {self.static_model_name}...")
+                self.search_texts = self._create_search_texts(df)
+                self.embeddings = self._normalize(self.static_model.encode(self.search_texts))
+                logger.info(f"Static embeddings built for {len(self.search_texts)} facility records")
+                
+                if cache_path is not None:
+                    self._save_embeddings(cache_path)
+        except Exception as e:
+            logger.error(f"Error building static embeddings: {e}")
+            self.static_model = None
+            self.embeddings = None
+            return
+        
+        if FAISS_AVAILABLE:
+            self._initialize_static_index(cache_path)
+    
+    def _initialize_static_index(self, cache_path: Optional[Path]) -> None:
+        """Load or build an HNSW index over the static embeddings"""
+        index_path = cache_path.with_suffix('.faiss') if cache_path is not None else None
+        try:
+            if index_path is not None and index_path.exists():
+                self.static_index = faiss.read_index(str(index_path))
+                logger.info(f"Loaded HNSW index from: {index_path}")
+            else:
+                # Approximate nearest neighbours: a query visits O(log N) graph
+                # nodes instead of scoring every facility
+                index = faiss.IndexHNSWFlat(self.embeddings.shape[1], HNSW_NEIGHBORS, faiss.METRIC_INNER_PRODUCT)
+                index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+                index.add(np.ascontiguousarray(self.embeddings, dtype=np.float32))
+                self.static_index = index
+                logger.info(f"HNSW index built for {index.ntotal} facility records")
+                
+                if index_path is not None:
+                    faiss.write_index(index, str(index_path))
             
-            # Add ABDM status if available
-            if pd.notna(row.get('ABDM Enabled')):
-                text_parts.append(f"ABDM {row['ABDM Enabled']}")
+            self.static_index.hnsw.efSearch = HNSW_EF_SEARCH
+        except Exception as e:
+            logger.warning(f"Could not prepare HNSW index, using exact search: {e}")
+            self.static_index = None
+    
+    def _embeddings_cache_path(self, df: pd.DataFrame) -> Optional[Path]:
+        """Cache file for the corpus embeddings, keyed on the model and the searched columns"""
+        if self.cache_dir is None:
+            return None
+        
+        columns = [c for c in SEARCH_TEXT_COLUMNS if c in df.columns]
+        digest = hashlib.sha1(self.static_model_name.encode())
+        digest.update(repr(columns).encode())
+        digest.update(pd.util.hash_pandas_object(df[columns], index=False).to_numpy().tobytes())
+        return self.cache_dir / f"search_embeddings_{digest.hexdigest()[:16]}.npy"
+    
+    def _save_embeddings(self, cache_path: Path) -> None:
+        """Persist the corpus embeddings, writing to a temp file first so readers never see a partial file"""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_name(cache_path.stem + '.tmp.npy')
+            np.save(tmp_path, self.embeddings)
+            os.replace(tmp_path, cache_path)
+            logger.info(f"Saved static embeddings to: {cache_path}")
+        except Exception as e:
+            logger.warning(f"Could not save static embeddings {cache_path}: {e}")
+    
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize rows as float32 so a dot product is the cosine similarity"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+    
+    def _static_search(self, query: str, df: pd.DataFrame, top_k: int) -> pd.DataFrame:
+        """Rank facilities by cosine similarity of static embeddings"""
+        query_embedding = self._normalize(self.static_model.encode([query]))
+        k = min(top_k, len(self.embeddings))
+        
+        if self.static_index is not None:
+            scores, top = self.static_index.search(query_embedding, k)
+            scores, top = scores[0], top[0]
+            # Unfilled result slots come back as -1
+            keep = (top >= 0) & (scores > RELEVANCE_THRESHOLD)
+            top, top_scores = top[keep], scores[keep]
+        else:
+            scores = self.embeddings @ query_embedding[0]
             
-            search_text = ' '.join(text_parts)
-            search_texts.append(search_text)
+            # Partial sort: only the top_k positions are ordered
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            top = top[scores[top] > RELEVANCE_THRESHOLD]
+            top_scores = scores[top]
         
-        return search_texts
+        if len(top) == 0:
+            logger.info("No relevant results found, falling back to text search")
+            return self._fallback_search(query, df)
+        
+        results_df = df.iloc[top].copy()
+        results_df['relevance_score'] = top_scores
+        return results_df
+    
+    def _create_search_texts(self, df: pd.DataFrame) -> List[str]:
+        """Create searchable text representations of facilities"""
+        if ARROW_AVAILABLE:
+            return self._create_search_texts_arrow(df)
+        
+        # Column-wise string ops: each present value contributes ' ' + prefix + value,
+        # missing values contribute nothing, and the leading space is dropped at the end
+        parts = []
+        for column in SEARCH_TEXT_COLUMNS:
+            if column in df.columns:
+                values = df[column]
+                prefix = SEARCH_TEXT_PREFIXES.get(column, '')
+                parts.append((' ' + prefix + values.astype(str)).where(values.notna(), ''))
+        
+        if not parts:
+            return [''] * len(df)
+        
+        search_texts = parts[0]
+        for part in parts[1:]:
+            search_texts = search_texts + part
+        
+        return search_texts.str[1:].tolist()
+    
+    @staticmethod
+    def _create_search_texts_arrow(df: pd.DataFrame) -> List[str]:
+        """Create the search texts with Arrow string kernels, skipping missing values"""
+        arrays = []
+        for column in SEARCH_TEXT_COLUMNS:
+            if column in df.columns:
+                # Missing values become None first: astype(str) alone turns
+                # NaN into the text 'nan' before pandas 3
+                column_values = df[column]
+                values = pa.array(
+                    column_values.astype(object).where(column_values.notna(), None),
+                    type=pa.string(), from_pandas=True
+                )
+                prefix = SEARCH_TEXT_PREFIXES.get(column)
+                if prefix:
+                    # Nulls propagate, so missing values stay missing
+                    values = pc.binary_join_element_wise(prefix, values, '')
+                arrays.append(values)
+        
+        if not arrays:
+            return [''] * len(df)
+        
+        # One multi-threaded kernel joins every column row-wise
+        joined = pc.binary_join_element_wise(*arrays, ' ', null_handling='skip')
+        return joined.to_pylist()
     
     def search(self, query: str, df: pd.DataFrame, top_k: int = 500) -> pd.DataFrame:
         """Perform natural language search on the facilities"""
@@ -123,6 +414,10 @@ class SearchEngine:
                 logger.warning("Search engine not initialized, using fallback search")
                 return self._fallback_search(query, df)
             
+            # Embeddings are row-aligned with the frame they were built from
+            if self.embeddings is not None and len(self.embeddings) == len(df):
+                return self._static_search(query, df, top_k)
+            
             if not SEARCH_AVAILABLE or self.model is None:
                 return self._fallback_search(query, df)
             
@@ -141,7 +436,7 @@ class SearchEngine:
             result_scores = scores[0]
             
             # Keep results with reasonable relevance scores
-            valid_mask = result_scores > 0.2  # Adjust threshold as needed
+            valid_mask = result_scores > RELEVANCE_THRESHOLD
             result_indices = result_indices[valid_mask]
             result_scores = result_scores[valid_mask]
             
@@ -169,15 +464,17 @@ class SearchEngine:
         # Create search mask
         search_mask = pd.Series(False, index=df.index)
         
-        # Search in multiple columns
-        search_columns = ['Name', 'Facility Type', 'Ownership', 'Address']
+        # Indexed text columns are answered from the token index
+        indexed_columns = self._token_indexed_columns(df)
+        if indexed_columns:
+            search_mask |= self._token_index_contains(query_terms)
         
-        for column in search_columns:
-            if column in df.columns:
-                column_text = df[column].astype(str).str.lower()
-                
-                for term in query_terms:
-                    search_mask |= column_text.str.contains(term, na=False, regex=False)
+        # Search in multiple columns
+        for column in FALLBACK_SEARCH_COLUMNS:
+            if column in df.columns and column not in indexed_columns:
+                search_mask |= _column_contains(
+                    df[column], *query_terms, lowered=self._lowercase_column(df, column)
+                )
         
         # Apply additional logic for common search patterns
         search_mask = self._apply_search_patterns(query.lower(), df, search_mask)
@@ -193,61 +490,78 @@ class SearchEngine:
     
     def _apply_search_patterns(self, query: str, df: pd.DataFrame, base_mask: pd.Series) -> pd.Series:
         """Apply specific search patterns for better results"""
+        def contains(column: str, term: str) -> np.ndarray:
+            return _column_contains(df[column], term, lowered=self._lowercase_column(df, column))
+        
         mask = base_mask.copy()
         
         # Government/public facilities
         if any(term in query for term in ['government', 'govt', 'public']):
             if 'Ownership' in df.columns:
-                mask |= df['Ownership'].str.lower().str.contains('government', na=False)
+                mask |= contains('Ownership', 'government')
         
         # Private facilities
         if 'private' in query:
             if 'Ownership' in df.columns:
-                mask |= df['Ownership'].str.lower().str.contains('private', na=False)
+                mask |= contains('Ownership', 'private')
         
         # Hospital types
         if 'hospital' in query:
             if 'Facility Type' in df.columns:
-                mask |= df['Facility Type'].str.lower().str.contains('hospital', na=False)
+                mask |= contains('Facility Type', 'hospital')
         
         # Primary health centers
         if any(term in query for term in ['phc', 'primary health']):
             if 'Facility Type' in df.columns:
-                mask |= df['Facility Type'].str.lower().str.contains('primary health', na=False)
+                mask |= contains('Facility Type', 'primary health')
         
         # Community health centers
         if any(term in query for term in ['chc', 'community health']):
             if 'Facility Type' in df.columns:
-                mask |= df['Facility Type'].str.lower().str.contains('community health', na=False)
+                mask |= contains('Facility Type', 'community health')
         
         # ABDM enabled
         if any(term in query for term in ['abdm', 'digital']):
             if 'ABDM Enabled' in df.columns:
-                mask |= df['ABDM Enabled'].str.lower().str.contains('yes', na=False)
+                mask |= contains('ABDM Enabled', 'yes')
         
         return mask
     
-    def get_search_suggestions(self, partial_query: str, df: pd.DataFrame) -> List[str]:
-        """Get search suggestions based on partial query"""
-        suggestions = []
+    @staticmethod
+    def _build_suggestion_terms(df: pd.DataFrame) -> List[Tuple[str, str]]:
+        """(lowercase term, suggestion) pairs in suggestion order"""
+        terms = []
         
         # Common facility types
-        facility_types = df['Facility Type'].dropna().unique()
-        for ft in facility_types:
-            if partial_query.lower() in ft.lower():
-                suggestions.append(ft)
+        for ft in df['Facility Type'].dropna().unique():
+            terms.append((ft.lower(), ft))
         
         # Common ownership types
-        ownership_types = df['Ownership'].dropna().unique()
-        for ot in ownership_types:
-            if partial_query.lower() in ot.lower():
-                suggestions.append(f"{ot} facilities")
+        for ot in df['Ownership'].dropna().unique():
+            terms.append((ot.lower(), f"{ot} facilities"))
         
         # Add state-based suggestions if state column exists
         if 'State' in df.columns:
-            states = df['State'].dropna().unique()
-            for state in states:
-                if partial_query.lower() in state.lower():
-                    suggestions.append(f"facilities in {state}")
+            for state in df['State'].dropna().unique():
+                terms.append((state.lower(), f"facilities in {state}"))
+        
+        return terms
+    
+    def get_search_suggestions(self, partial_query: str, df: pd.DataFrame) -> List[str]:
+        """Get search suggestions based on partial query"""
+        # The distinct values are only rescanned when df is not the frame
+        # the engine was initialized with
+        if self.suggestion_terms is not None and df.index.equals(self.lowercase_index):
+            terms = self.suggestion_terms
+        else:
+            terms = self._build_suggestion_terms(df)
+        
+        partial_query = partial_query.lower()
+        suggestions = []
+        for term, suggestion in terms:
+            if partial_query in term:
+                suggestions.append(suggestion)
+                if len(suggestions) == 5:  # Return top 5 suggestions
+                    break
         
-        return suggestions[:5]  # Return top 5 suggestions
+        return suggestions
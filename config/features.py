@@ -2,6 +2,10 @@
 Application Configuration Toggle
 """
 
+import logging
+
+logger = logging.getLogger(__name__)
+
 # Feature Flags
 ENABLE_AI_SEARCH = False  # Set to True to enable AI-powered search (may cause stability issues)
 ENABLE_CLUSTERING = True   # Set to False to disable map clustering
@@ -25,8 +29,17 @@ FALLBACK_SEARCH_ONLY = True  # Use only text-based search (recommended for stabi
 SEARCH_CASE_SENSITIVE = False
 SEARCH_PARTIAL_MATCH = True
 
-print("🔧 Configuration loaded:")
-print(f"   • AI Search: {'Enabled' if ENABLE_AI_SEARCH else 'Disabled (for stability)'}")
-print(f"   • Map Clustering: {'Enabled' if ENABLE_CLUSTERING else 'Disabled'}")
-print(f"   • Max Map Points: {MAX_MAP_POINTS:,}")
-print(f"   • Search Mode: {'Text-based only' if FALLBACK_SEARCH_ONLY else 'Hybrid AI + Text'}")
+CONFIGURATION_SUMMARY = "\n".join([
+    "🔧 Configuration loaded:",
+    f"   • AI Search: {'Enabled' if ENABLE_AI_SEARCH else 'Disabled (for stability)'}",
+    f"   • Map Clustering: {'Enabled' if ENABLE_CLUSTERING else 'Disabled'}",
+    f"   • Max Map Points: {MAX_MAP_POINTS:,}",
+    f"   • Search Mode: {'Text-based only' if FALLBACK_SEARCH_ONLY else 'Hybrid AI + Text'}",
+])
+
+# Only echoed on import when debugging; run this module to print it
+if SHOW_DEBUG_INFO:
+    logger.info(CONFIGURATION_SUMMARY)
+
+if __name__ == "__main__":
+    print(CONFIGURATION_SUMMARY)
@@ -20,6 +20,12 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.data_loader import DataLoader
 
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -41,9 +47,21 @@ def main():
                        help='Only analyze duplicates without creating deduplicated file')
     parser.add_argument('--output', default='data/NHA_Master_deduplicated.csv',
                        help='Output file path for deduplicated dataset')
+    parser.add_argument('--engine', choices=['pandas', 'polars'], default='pandas',
+                       help='Engine for deduplication; polars streams the CSV and supports '
+                            'the simple and comprehensive strategies')
     
     args = parser.parse_args()
     
+    if args.engine == 'polars' and not args.analyze_only:
+        if not POLARS_AVAILABLE:
+            logger.error("Polars is not installed. Use --engine pandas or install polars.")
+            return 1
+        if args.strategy == 'intelligent':
+            logger.error("The intelligent strategy needs fuzzy matching and is only available with --engine pandas")
+            return 1
+        return deduplicate_with_polars(args.strategy, Path(args.output))
+    
     logger.info("=" * 60)
     logger.info("NHA Healthcare Facilities Dataset Deduplication")
     logger.info("=" * 60)
@@ -104,6 +122,51 @@ def main():
     return 0
 
 
+def deduplicate_with_polars(strategy, output_path):
+    """Deduplicate the master CSV with a streaming Polars query
+    
+    Mirrors DataLoader's coordinate validation and the simple/comprehensive
+    dedup keys, but never holds the whole dataset in memory. Facility type
+    and ownership standardization and the markdown report are pandas-only.
+    """
+    csv_path = DataLoader().find_master_file()
+    if csv_path is None:
+        logger.error("Failed to locate dataset. Exiting.")
+        return 1
+    
+    logger.info(f"Streaming {csv_path} through Polars ({strategy} strategy)...")
+    
+    latitude = pl.col('Latitude').cast(pl.Float64, strict=False)
+    longitude = pl.col('Longitude').cast(pl.Float64, strict=False)
+    
+    name_key = pl.col('Name').cast(pl.Utf8).str.strip_chars().str.to_uppercase()
+    if strategy == 'comprehensive':
+        name_key = name_key.str.replace_all(r'[^\w\s]', '').str.replace_all(r'\s+', ' ')
+    dedup_keys = [name_key.alias('Name_cleaned')]
+    if strategy == 'comprehensive':
+        # Round coordinates to reduce minor GPS variations
+        dedup_keys += [latitude.round(4).alias('Lat_rounded'), longitude.round(4).alias('Lon_rounded')]
+    key_names = [key.meta.output_name() for key in dedup_keys]
+    
+    query = (
+        pl.scan_csv(csv_path, infer_schema=False)
+        .with_columns(Latitude=latitude, Longitude=longitude)
+        # Remove rows with invalid coordinates
+        .filter(latitude.is_between(-90, 90) & longitude.is_between(-180, 180))
+        .with_columns(dedup_keys)
+        .unique(subset=key_names, keep='first', maintain_order=True)
+        .drop(key_names)
+    )
+    
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    query.sink_csv(output_path)
+    
+    final_count = pl.scan_csv(output_path, infer_schema=False).select(pl.len()).collect().item()
+    logger.info(f"Deduplicated records:  {final_count:,}")
+    logger.info(f"Deduplicated dataset saved to: {output_path}")
+    return 0
+
+
 def print_duplicate_analysis(analysis):
     """Print detailed duplicate analysis"""
     summary = analysis['summary']
@@ -156,9 +219,11 @@ def generate_deduplication_report(original_df, deduplicated_df, analysis, strate
         original_count = len(original_df)
         final_count = len(deduplicated_df)
         removed_count = original_count - final_count
+        # One pass over the deduplicated names serves every per-name lookup below
+        dedup_names = deduplicated_df['Name'].value_counts()
         
         f.write(f"| Total Records | {original_count:,} | {final_count:,} | -{removed_count:,} |\n")
-        f.write(f"| Unique Names | {analysis['summary']['unique_names']:,} | {deduplicated_df['Name'].nunique():,} | - |\n")
+        f.write(f"| Unique Names | {analysis['summary']['unique_names']:,} | {len(dedup_names):,} | - |\n")
         f.write(f"| Reduction | - | - | {(removed_count/original_count)*100:.2f}% |\n\n")
         
         # Facility type comparison
@@ -169,21 +234,24 @@ def generate_deduplication_report(original_df, deduplicated_df, analysis, strate
         original_types = original_df['Facility Type'].value_counts()
         dedup_types = deduplicated_df['Facility Type'].value_counts()
         
-        for ftype in original_types.index:
-            orig_count = original_types.get(ftype, 0)
-            dedup_count = dedup_types.get(ftype, 0)
-            change = dedup_count - orig_count
-            f.write(f"| {ftype} | {orig_count:,} | {dedup_count:,} | {change:+,} |\n")
+        # Each table is formatted as a list of rows and written in one call
+        type_counts = zip(original_types.index, original_types, dedup_types.reindex(original_types.index, fill_value=0))
+        f.writelines(
+            f"| {ftype} | {orig_count:,} | {dedup_count:,} | {dedup_count - orig_count:+,} |\n"
+            for ftype, orig_count, dedup_count in type_counts
+        )
         
         # Top duplicates removed
         f.write("\n## Top Duplicate Facilities Removed\n\n")
         f.write("| Facility Name | Original Count | After Deduplication | Removed |\n")
         f.write("|---------------|----------------|--------------------|---------|\n")
         
-        for name, orig_count in list(analysis['top_duplicates'].items())[:20]:
-            dedup_count = len(deduplicated_df[deduplicated_df['Name'] == name])
-            removed = orig_count - dedup_count
-            f.write(f"| {name[:50]} | {orig_count} | {dedup_count} | {removed} |\n")
+        top_counts = [(name, orig_count, dedup_names.get(name, 0))
+                      for name, orig_count in list(analysis['top_duplicates'].items())[:20]]
+        f.writelines(
+            f"| {name[:50]} | {orig_count} | {dedup_count} | {orig_count - dedup_count} |\n"
+            for name, orig_count, dedup_count in top_counts
+        )
         
         # Geographic impact
         if 'geographic_patterns' in analysis:
@@ -192,11 +260,11 @@ def generate_deduplication_report(original_df, deduplicated_df, analysis, strate
             f.write("| Facility Name | Count | Lat Spread | Lon Spread | Likely Duplicates |\n")
             f.write("|---------------|-------|------------|------------|-------------------|\n")
             
-            for name, info in list(analysis['geographic_patterns'].items())[:15]:
-                likely = "Yes" if info['likely_duplicates'] else "No"
-                lat_spread = info['coordinate_spread']['latitude']
-                lon_spread = info['coordinate_spread']['longitude']
-                f.write(f"| {name[:40]} | {info['count']} | {lat_spread:.4f}° | {lon_spread:.4f}° | {likely} |\n")
+            f.writelines(
+                f"| {name[:40]} | {info['count']} | {info['coordinate_spread']['latitude']:.4f}° | "
+                f"{info['coordinate_spread']['longitude']:.4f}° | {'Yes' if info['likely_duplicates'] else 'No'} |\n"
+                for name, info in list(analysis['geographic_patterns'].items())[:15]
+            )
         
         # Recommendations
         f.write("\n## Recommendations\n\n")
@@ -245,7 +313,8 @@ def compare_strategies():
     
     for strategy in strategies:
         logger.info(f"Testing {strategy} strategy...")
-        deduplicated = data_loader.deduplicate_by_name(df.copy(), strategy=strategy)
+        # Strategies build their keys apart from df, so every run can share it
+        deduplicated = data_loader.deduplicate_by_name(df, strategy=strategy)
         final_count = len(deduplicated)
         removed = original_count - final_count
         percentage = (removed / original_count) * 100
@@ -4,11 +4,14 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import folium
+from folium.plugins import FastMarkerCluster
 from streamlit_folium import st_folium
 import numpy as np
 from sentence_transformers import SentenceTransformer
 import faiss
 import re
+import os
+import hashlib
 from datetime import datetime
 import altair as alt
 
@@ -44,63 +47,102 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# Master CSV and the typed Parquet copy written next to it on first load
+DATA_FILE = 'NHA_Master_merged_TEST.csv'
+DATA_PARQUET = os.path.splitext(DATA_FILE)[0] + '.parquet'
+# Columns the dashboard actually uses; everything else is never read.
+# ABDM Enabled is optional, the dashboard checks for it before use
+DATA_COLUMNS = ['Name', 'Address', 'Facility Type', 'Ownership', 'ABDM Enabled', 'Latitude', 'Longitude']
+
+def read_master_data():
+    """Read the dashboard columns, preferring an up-to-date Parquet copy of the CSV"""
+    # Only the header is parsed, so columns missing from the CSV are skipped
+    header = pd.read_csv(DATA_FILE, nrows=0).columns
+    columns = [column for column in DATA_COLUMNS if column in header]
+
+    if os.path.exists(DATA_PARQUET) and os.path.getmtime(DATA_PARQUET) >= os.path.getmtime(DATA_FILE):
+        try:
+            return pd.read_parquet(DATA_PARQUET, columns=columns)
+        except Exception:
+            pass  # Stale layout (e.g. DATA_COLUMNS changed); rebuild from the CSV
+
+    df = pd.read_csv(DATA_FILE, usecols=columns, low_memory=False)
+    df['Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
+    df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
+
+    # Parquet keeps the coordinates typed, so later loads skip parsing and conversion
+    try:
+        df.to_parquet(DATA_PARQUET, index=False, compression='zstd')
+    except Exception as e:
+        st.warning(f"Could not write Parquet copy {DATA_PARQUET}: {e}")
+    return df
+
 @st.cache_data
 def load_data():
     """Load the NHA Master dataset"""
     try:
-        df = pd.read_csv('NHA_Master_merged_TEST.csv')
-
-        # Clean and prepare data
-        df['Latitude'] = pd.to_numeric(df['Latitude'], errors='coerce')
-        df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
+        df = read_master_data()
 
-        # Remove rows with invalid coordinates
-        df = df.dropna(subset=['Latitude', 'Longitude'])
-
-        # Filter out obviously incorrect coordinates
-        df = df[
-            (df['Latitude'].between(-90, 90)) & 
-            (df['Longitude'].between(-180, 180))
-        ]
-
-        return df
+        # Keep rows with coordinates inside the valid range (NaN fails both checks)
+        valid_coords = df['Latitude'].between(-90, 90) & df['Longitude'].between(-180, 180)
+        return df[valid_coords]
     except Exception as e:
         st.error(f"Error loading data: {e}")
         return None
 
+# Columns joined into each facility's searchable text, in order
+SEARCH_COLUMNS = ['Name', 'Address', 'Facility Type', 'Ownership']
+# Sentence-transformers model used for facility and query embeddings
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+# HNSW graph degree and build/query beam widths for the ANN search index
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+# FAISS indexes are saved here so reruns skip encoding the whole corpus
+SEARCH_INDEX_DIR = '.cache'
+
+def build_search_texts(df):
+    """Join the non-missing search columns of every row with spaces"""
+    texts = pd.Series(np.nan, index=df.index, dtype=object)
+    for col in SEARCH_COLUMNS:
+        if col not in df.columns:
+            continue
+        part = df[col].astype(str).astype(object).where(df[col].notna())
+        # Both present: join; otherwise keep whichever one exists
+        texts = (texts + ' ' + part).fillna(texts).fillna(part)
+    return texts.fillna('').tolist()
+
 @st.cache_resource
 def initialize_search_engine(df):
     """Initialize the natural language search engine"""
     try:
         # Use a lightweight sentence transformer model
-        model = SentenceTransformer('all-MiniLM-L6-v2')
+        model = SentenceTransformer(EMBEDDING_MODEL)
 
         # Create searchable text from facility information
-        search_texts = []
-        for _, row in df.iterrows():
-            text_parts = []
-            if pd.notna(row.get('Name')):
-                text_parts.append(str(row['Name']))
-            if pd.notna(row.get('Address')):
-                text_parts.append(str(row['Address']))
-            if pd.notna(row.get('Facility Type')):
-                text_parts.append(str(row['Facility Type']))
-            if pd.notna(row.get('Ownership')):
-                text_parts.append(str(row['Ownership']))
-
-            search_text = ' '.join(text_parts)
-            search_texts.append(search_text)
-
-        # Create embeddings
-        embeddings = model.encode(search_texts)
-
-        # Create FAISS index
-        dimension = embeddings.shape[1]
-        index = faiss.IndexFlatIP(dimension)  # Inner product (cosine similarity)
-
-        # Normalize embeddings for cosine similarity
-        faiss.normalize_L2(embeddings)
-        index.add(embeddings.astype('float32'))
+        search_texts = build_search_texts(df)
+
+        digest = hashlib.sha1(f"{EMBEDDING_MODEL}-hnsw{HNSW_M}".encode())
+        digest.update('\n'.join(search_texts).encode())
+        index_path = os.path.join(SEARCH_INDEX_DIR, f"nha_search_{digest.hexdigest()[:16]}.faiss")
+        if os.path.exists(index_path):
+            index = faiss.read_index(index_path)
+        else:
+            # Embeddings come back L2-normalised, so inner product is cosine similarity
+            embeddings = model.encode(
+                search_texts, batch_size=256, convert_to_numpy=True,
+                normalize_embeddings=True, show_progress_bar=False,
+            )
+
+            # Create FAISS HNSW index (approximate inner-product search)
+            dimension = embeddings.shape[1]
+            index = faiss.IndexHNSWFlat(dimension, HNSW_M, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efConstruction = HNSW_EF_CONSTRUCTION
+            index.add(embeddings.astype('float32'))
+
+            os.makedirs(SEARCH_INDEX_DIR, exist_ok=True)
+            faiss.write_index(index, index_path)
+        index.hnsw.efSearch = HNSW_EF_SEARCH
 
         return model, index, search_texts
     except Exception as e:
@@ -114,8 +156,7 @@ def natural_language_search(query, model, index, search_texts, df, top_k=100):
 
     try:
         # Encode the query
-        query_embedding = model.encode([query])
-        faiss.normalize_L2(query_embedding)
+        query_embedding = model.encode([query], convert_to_numpy=True, normalize_embeddings=True)
 
         # Search
         scores, indices = index.search(query_embedding.astype('float32'), min(top_k, len(df)))
@@ -142,21 +183,33 @@ def natural_language_search(query, model, index, search_texts, df, top_k=100):
         st.error(f"Search error: {e}")
         return df.head(100)
 
+# Client-side marker factory for FastMarkerCluster; each row is
+# [lat, lon, name, facility type, ownership, address, colour]
+MAP_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 6, color: row[6], fillColor: row[6], fillOpacity: 0.8
+    });
+    marker.bindTooltip(row[2]);
+    marker.bindPopup(
+        '<b>' + row[2] + '</b><br>' +
+        'Type: ' + row[3] + '<br>' +
+        'Ownership: ' + row[4] + '<br>' +
+        'Address: ' + row[5] + '...',
+        {maxWidth: 300}
+    );
+    return marker;
+}
+"""
+
 def create_map(df_filtered):
     """Create an interactive map"""
     if df_filtered.empty:
         return None
 
-    # Sample data if too large for performance
-    if len(df_filtered) > 1000:
-        df_map = df_filtered.sample(1000)
-        st.info(f"Showing 1000 random facilities out of {len(df_filtered)} for map performance")
-    else:
-        df_map = df_filtered
-
     # Calculate center
-    center_lat = df_map['Latitude'].mean()
-    center_lon = df_map['Longitude'].mean()
+    center_lat = df_filtered['Latitude'].mean()
+    center_lon = df_filtered['Longitude'].mean()
 
     # Create map
     m = folium.Map(location=[center_lat, center_lon], zoom_start=6)
@@ -172,22 +225,22 @@ def create_map(df_filtered):
         'Default': 'gray'
     }
 
-    for _, row in df_map.iterrows():
-        color = facility_colors.get(row['Facility Type'], facility_colors['Default'])
-
-        popup_text = f"""
-        <b>{row['Name']}</b><br>
-        Type: {row['Facility Type']}<br>
-        Ownership: {row['Ownership']}<br>
-        Address: {row['Address'][:100]}...
-        """
-
-        folium.Marker(
-            [row['Latitude'], row['Longitude']],
-            popup=folium.Popup(popup_text, max_width=300),
-            tooltip=row['Name'],
-            icon=folium.Icon(color=color)
-        ).add_to(m)
+    # Ship every facility as one JS array and let the browser build and cluster the markers
+    def text(col):
+        return df_filtered[col].fillna('').astype(str)
+
+    colors = df_filtered['Facility Type'].map(facility_colors).fillna(facility_colors['Default'])
+    marker_data = pd.DataFrame({
+        'lat': df_filtered['Latitude'],
+        'lon': df_filtered['Longitude'],
+        'name': text('Name'),
+        'type': text('Facility Type'),
+        'ownership': text('Ownership'),
+        'address': text('Address').str[:100],
+        'color': colors.astype(str),
+    }).to_numpy().tolist()
+
+    FastMarkerCluster(marker_data, callback=MAP_MARKER_CALLBACK).add_to(m)
 
     return m
 
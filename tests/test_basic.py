@@ -40,6 +40,18 @@ class TestDataLoader:
         # This would test the validation method when implemented
         assert len(test_data) == 2
         assert 'Name' in test_data.columns
+    
+    def test_preprocessing_keeps_coordinate_precision(self):
+        """Test that preprocessing does not round the coordinates"""
+        test_data = pd.DataFrame({
+            'Name': ['Test Hospital', 'Test Clinic'],
+            'Latitude': ['11.618024922619044', '28.6139'],
+            'Longitude': ['92.731598', '77.2090']
+        })
+        
+        df = DataLoader()._preprocess_data(test_data)
+        assert df['Latitude'].tolist() == [11.618024922619044, 28.6139]
+        assert df['Longitude'].tolist() == [92.731598, 77.2090]
 
 
 class TestSearchEngine:
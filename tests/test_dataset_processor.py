@@ -0,0 +1,122 @@
+"""
+Tests for the dataset processor's CSV reading and writing
+
+Run with: pytest tests/ -v
+"""
+
+import pytest
+import pandas as pd
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dataset_processor
+from dataset_processor import DatasetProcessor, write_csv_file, categorize_columns
+
+
+SAMPLE_CSV = (
+    'id,opened,updated,score,ratio,active,name,note\n'
+    '1,2024-01-01,2024-01-01 10:30,1.0,0.5,true,"Clinic, North",x\n'
+    '2,2024-02-29,,2.0,1e-05,false,,"say ""hi"""\n'
+)
+
+
+@pytest.fixture
+def sample_csv(tmp_path):
+    """A small CSV with dates, whole floats, booleans, quotes and blanks"""
+    path = tmp_path / 'sample.csv'
+    path.write_text(SAMPLE_CSV)
+    return path
+
+
+@pytest.fixture
+def processor(tmp_path):
+    """A processor that keeps cached analyses out of the user's home directory"""
+    return DatasetProcessor(analysis_cache_dir=tmp_path / 'cache')
+
+
+class TestCsvRoundTrip:
+    """Test cases for loading a CSV and saving it back"""
+
+    def test_round_trip_keeps_values(self, processor, sample_csv, tmp_path):
+        """Test that a loaded and saved CSV reads back as the original"""
+        assert processor.load_and_add_dataset(sample_csv)
+        output = tmp_path / 'output.csv'
+        assert processor.save_dataset(output)
+
+        pd.testing.assert_frame_equal(pd.read_csv(output), pd.read_csv(sample_csv))
+
+    def test_dates_stay_as_text(self, processor, sample_csv):
+        """Test that date columns are not reformatted as timestamps"""
+        processor.load_and_add_dataset(sample_csv)
+
+        assert processor.master_df['opened'].tolist() == ['2024-01-01', '2024-02-29']
+        assert processor.master_df['updated'].iloc[0] == '2024-01-01 10:30'
+
+    def test_arrow_and_pandas_writers_agree(self, processor, sample_csv, tmp_path):
+        """Test that the Arrow writer gives the same values as DataFrame.to_csv"""
+        processor.load_and_add_dataset(sample_csv)
+        arrow_output = tmp_path / 'arrow.csv'
+        pandas_output = tmp_path / 'pandas.csv'
+        write_csv_file(processor.master_df, arrow_output)
+        processor.master_df.to_csv(pandas_output, index=False)
+
+        pd.testing.assert_frame_equal(pd.read_csv(arrow_output), pd.read_csv(pandas_output))
+
+
+class TestAnalysisCache:
+    """Test cases for reusing analyses of unchanged files"""
+
+    def test_reused_analysis_is_restamped(self, processor, sample_csv, tmp_path):
+        """Test that a cached analysis is reused with the current run's timestamp"""
+        processor.load_and_add_dataset(sample_csv)
+        first = processor.merge_history[0]['analysis']
+
+        later = DatasetProcessor(analysis_cache_dir=tmp_path / 'cache')
+        later.load_and_add_dataset(sample_csv)
+        reused = later.merge_history[0]['analysis']
+
+        assert len(list((tmp_path / 'cache').iterdir())) == 1
+        assert reused['missing_values'] == first['missing_values']
+        assert reused['timestamp'] > first['timestamp']
+
+    def test_cache_key_includes_version(self, sample_csv, tmp_path, monkeypatch):
+        """Test that a new analysis version does not reuse older cache entries"""
+        before = dataset_processor.analysis_cache_path(sample_csv, {}, tmp_path)
+        monkeypatch.setattr(dataset_processor, 'ANALYSIS_CACHE_VERSION', dataset_processor.ANALYSIS_CACHE_VERSION + 1)
+
+        assert dataset_processor.analysis_cache_path(sample_csv, {}, tmp_path) != before
+
+    def test_cache_can_be_disabled(self, sample_csv, tmp_path):
+        """Test that no cache directory is written when caching is off"""
+        processor = DatasetProcessor(analysis_cache_dir=None)
+
+        assert processor.load_and_add_dataset(sample_csv)
+        assert sorted(path.name for path in tmp_path.iterdir()) == ['sample.csv']
+
+
+class TestAnalyzeDataset:
+    """Test cases for dataset analysis"""
+
+    @pytest.mark.parametrize('use_arrow', [True, False])
+    def test_categorized_column_is_categorical(self, processor, monkeypatch, use_arrow):
+        """Test that a column stored as category is reported and profiled as categorical"""
+        if not use_arrow:
+            monkeypatch.setattr(dataset_processor, 'to_arrow_table', lambda df: None)
+        df = categorize_columns(pd.DataFrame({
+            'id': range(8),
+            'ownership': ['Private', 'Public'] * 4,
+        }))
+        assert isinstance(df['ownership'].dtype, pd.CategoricalDtype)
+
+        analysis = processor.analyze_dataset(df)
+
+        assert 'ownership' in analysis['categorical_columns']
+        assert analysis['categorical_stats']['ownership'] == {'Private': 4, 'Public': 4}
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
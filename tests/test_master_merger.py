@@ -0,0 +1,96 @@
+"""
+Tests for the master merger's checkpoints
+
+Run with: pytest tests/ -v
+"""
+
+import pytest
+import pandas as pd
+import json
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import master_merger
+from master_merger import MasterMerger, DATASET_FILES
+
+
+MERGE_ORDER = ['PHC', 'NIN']
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """A data directory whose input files predate any checkpoint"""
+    if not master_merger.ARROW_AVAILABLE:
+        pytest.skip("pyarrow is required for checkpoints")
+    for ds_name in ['NHA'] + MERGE_ORDER:
+        path = tmp_path / DATASET_FILES[ds_name]
+        path.write_text('')
+        os.utime(path, (0, 0))
+    return str(tmp_path)
+
+
+def make_master(n_rows):
+    """A small master frame with the columns resume() rebuilds its indexes from"""
+    return pd.DataFrame({
+        'facility_name_clean': [f'health centre {i}' for i in range(n_rows)],
+        'latitude': [10.0 + i / 100 for i in range(n_rows)],
+        'longitude': [76.0 + i / 100 for i in range(n_rows)],
+        'state': ['kerala'] * n_rows,
+        'address': [f'ward {i} ' * 50 for i in range(n_rows)],
+    })
+
+
+class TestCheckpoints:
+    """Test cases for saving and resuming merge checkpoints"""
+
+    def test_save_resume_save(self, data_dir):
+        """Test that a resumed master survives the next checkpoint overwriting the old one"""
+        first = MasterMerger(data_dir)
+        first.master = make_master(200)
+        first.stats = {'PHC': {'matched': 3}}
+        first.save_checkpoint(MERGE_ORDER[:1])
+
+        resumed = MasterMerger(data_dir)
+        assert resumed.resume(MERGE_ORDER) == 1
+        pd.testing.assert_frame_equal(resumed.master, first.master)
+        assert resumed.stats == first.stats
+
+        resumed.master = pd.concat([resumed.master, make_master(10)], ignore_index=True)
+        resumed.save_checkpoint(MERGE_ORDER)
+        # Reading every value again touches any pages still mapped from the first file
+        assert resumed.master['address'].str.len().sum() > 0
+
+        final = MasterMerger(data_dir)
+        assert final.resume(MERGE_ORDER) == 2
+        pd.testing.assert_frame_equal(final.master, resumed.master)
+
+    def test_mismatched_state_is_ignored(self, data_dir):
+        """Test that a state file from another step than the master is not resumed"""
+        merger = MasterMerger(data_dir)
+        merger.master = make_master(20)
+        merger.save_checkpoint(MERGE_ORDER[:1])
+
+        # As if a run died after swapping in only the later state file
+        _, state_path = merger._checkpoint_paths()
+        with open(state_path, 'w') as f:
+            json.dump({'merged': MERGE_ORDER, 'stats': {}, 'sample_matches': []}, f)
+
+        assert MasterMerger(data_dir).resume(MERGE_ORDER) == 0
+
+    def test_clear_checkpoint(self, data_dir):
+        """Test that clearing removes the checkpoint files"""
+        merger = MasterMerger(data_dir)
+        merger.master = make_master(5)
+        merger.save_checkpoint(MERGE_ORDER[:1])
+        merger.clear_checkpoint()
+
+        assert not any(os.path.exists(path) for path in merger._checkpoint_paths())
+        assert MasterMerger(data_dir).resume(MERGE_ORDER) == 0
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
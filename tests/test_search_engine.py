@@ -0,0 +1,165 @@
+"""
+Tests for the search engine's text search
+
+Run with: pytest tests/ -v
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import components.search_engine as search_engine
+from components.search_engine import SearchEngine, FALLBACK_SEARCH_COLUMNS, _column_contains
+
+
+# None of these trigger the extra patterns in _apply_search_patterns
+QUERIES = [
+    'apollo',
+    'APOLLO clinic',
+    'st.',
+    'c++',
+    '(main',
+    'road)',
+    '[a-z]',
+    'a*b',
+    'sector-',
+    'mumbai|pune',
+    'trust',
+    'zzz-no-match',
+]
+
+
+def row_scan_mask(df: pd.DataFrame, query: str) -> np.ndarray:
+    """Per-row literal substring scan, the way text search worked before the token index"""
+    mask = pd.Series(False, index=df.index)
+    for column in FALLBACK_SEARCH_COLUMNS:
+        if column in df.columns:
+            column_text = df[column].astype(str).str.lower()
+            for term in query.lower().split():
+                mask |= column_text.str.contains(term, na=False, regex=False)
+    return mask.to_numpy(dtype=bool)
+
+
+@pytest.fixture
+def facilities():
+    """A small facility frame with regex metacharacters, missing values and category columns"""
+    return pd.DataFrame({
+        'Name': [
+            'Apollo Clinic', 'St. Mary (Main) Hospital', 'C++ Diagnostics', np.nan,
+            'A*B Labs', 'Mumbai|Pune Care', 'Sector-7 Dispensary', 'apollo  pharmacy',
+        ],
+        'Facility Type': pd.Categorical([
+            'Clinic', 'Hospital', 'Diagnostic Lab', 'Clinic',
+            np.nan, 'Clinic', 'Dispensary', 'Pharmacy',
+        ]),
+        'Ownership': pd.Categorical([
+            'Private', 'Trust', np.nan, 'Government',
+            'Private', 'Private', 'Government', 'Trust',
+        ]),
+        'Address': [
+            'MG Road) Block [A-Z]', np.nan, 'Sector 12', 'Old Town Road',
+            'Ring Road', 'Station Road', 'Main Bazaar', 'Temple Street',
+        ],
+    }, index=[10, 11, 12, 13, 14, 15, 16, 17])
+
+
+@pytest.fixture
+def engine(facilities, monkeypatch):
+    """A search engine initialized on the facility frame, without embeddings"""
+    if not search_engine.ARROW_AVAILABLE:
+        pytest.skip("pyarrow is required for the token index")
+    monkeypatch.setattr(search_engine, 'STATIC_EMBEDDINGS_AVAILABLE', False)
+    engine = SearchEngine(cache_dir=None)
+    engine.initialize(facilities)
+    return engine
+
+
+class TestTextSearch:
+    """Test cases for the indexed text search against a per-row scan"""
+
+    def test_token_index_is_built(self, engine):
+        """Test that the free-text columns are answered from the token index"""
+        assert engine.token_vocabulary is not None
+        assert set(engine.token_index_columns) == {'Name', 'Address'}
+
+    @pytest.mark.parametrize('query', QUERIES)
+    def test_indexed_search_matches_row_scan(self, engine, facilities, query):
+        """Test that the token index finds the same rows as scanning every row"""
+        results = engine._fallback_search(query, facilities)
+        expected = facilities[row_scan_mask(facilities, query)]
+
+        assert results.index.tolist() == expected.index.tolist()
+
+    @pytest.mark.parametrize('query', QUERIES)
+    def test_filtered_subset_matches_row_scan(self, engine, facilities, query):
+        """Test that a filtered frame, which the index cannot answer, gives the same rows as a scan"""
+        subset = facilities[facilities['Ownership'] != 'Government']
+        assert engine._token_indexed_columns(subset) == ()
+
+        results = engine._fallback_search(query, subset)
+        expected = subset[row_scan_mask(subset, query)]
+
+        assert results.index.tolist() == expected.index.tolist()
+
+    @pytest.mark.parametrize('column', FALLBACK_SEARCH_COLUMNS)
+    @pytest.mark.parametrize('query', QUERIES)
+    def test_column_contains_matches_row_scan(self, facilities, column, query):
+        """Test that per-category matching and missing codes agree with a row scan"""
+        terms = query.lower().split()
+        column_text = facilities[column].astype(str).str.lower()
+        expected = np.zeros(len(facilities), dtype=bool)
+        for term in terms:
+            expected |= column_text.str.contains(term, na=False, regex=False).to_numpy(dtype=bool)
+
+        assert _column_contains(facilities[column], *terms).tolist() == expected.tolist()
+
+    def test_missing_values_never_match(self, engine, facilities):
+        """Test that rows with a missing Name are not matched on that column"""
+        mask = engine._token_index_contains(['apollo'])
+
+        assert not mask[facilities.index.get_loc(13)]
+
+
+
+class TestSearchTexts:
+    """Test cases for the texts embedded for semantic search"""
+
+    @pytest.fixture
+    def facilities_with_gaps(self):
+        """Facilities with missing values in plain, category and prefixed columns"""
+        return pd.DataFrame({
+            'Name': ['Apollo Clinic', np.nan, 'City Hospital'],
+            'Facility Type': pd.Categorical(['Clinic', 'Hospital', np.nan]),
+            'State': ['Kerala', np.nan, 'Goa'],
+            'Specialties': [np.nan, 'Cardiology', np.nan],
+            'ABDM Enabled': ['Yes', np.nan, 'No'],
+        })
+
+    def test_missing_values_are_skipped(self, facilities_with_gaps):
+        """Test that missing values add nothing to the search text"""
+        texts = SearchEngine()._create_search_texts(facilities_with_gaps)
+
+        assert texts == [
+            'Apollo Clinic Clinic Kerala ABDM Yes',
+            'Hospital Cardiology',
+            'City Hospital Goa ABDM No',
+        ]
+
+    def test_arrow_and_pandas_texts_agree(self, facilities_with_gaps, monkeypatch):
+        """Test that the Arrow kernels build the same texts as the pandas string ops"""
+        if not search_engine.ARROW_AVAILABLE:
+            pytest.skip("pyarrow is required for the Arrow search texts")
+        arrow_texts = SearchEngine()._create_search_texts(facilities_with_gaps)
+        monkeypatch.setattr(search_engine, 'ARROW_AVAILABLE', False)
+
+        assert SearchEngine()._create_search_texts(facilities_with_gaps) == arrow_texts
+
+
+if __name__ == "__main__":
+    # Run tests if this file is executed directly
+    pytest.main([__file__, "-v"])
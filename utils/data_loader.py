@@ -8,9 +8,142 @@ import logging
 from pathlib import Path
 from typing import Optional, List, Dict, Any
 import os
+import json
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    ARROW_AVAILABLE = True
+except ImportError:
+    ARROW_AVAILABLE = False
+
+# Columns preprocessing needs, always loaded even when a caller prunes columns
+REQUIRED_COLUMNS = ('Latitude', 'Longitude')
+
+# Low-cardinality columns stored as category dtype after preprocessing
+CATEGORICAL_COLUMNS = ('Facility Type', 'Ownership', 'State', 'ABDM Enabled')
+
+# Suffix of the preprocessed Parquet cache written next to a dataset CSV;
+# its stamp file records the inputs the cache was built from
+PREPROCESSED_SUFFIX = '.preprocessed.parquet'
+
+# Lowercased facility type spellings and their standard names
+FACILITY_TYPE_MAPPINGS = {
+    'phc': 'Primary Health Centre',
+    'primary health centre': 'Primary Health Centre',
+    'chc': 'Community Health Centre',
+    'community health centre': 'Community Health Centre',
+    'hospital': 'Hospital',
+    'clinic': 'Clinic/ Dispensary',
+    'dispensary': 'Clinic/ Dispensary',
+    'clinic/ dispensary': 'Clinic/ Dispensary',
+    'sub centre': 'Sub Centre',
+    'subcentre': 'Sub Centre',
+    'pharmacy': 'Pharmacy'
+}
+
+# Lowercased ownership spellings and their standard names
+OWNERSHIP_MAPPINGS = {
+    'govt': 'Government',
+    'government': 'Government',
+    'public': 'Government',
+    'private': 'Private',
+    'ppp': 'PPP',
+    'public private partnership': 'PPP'
+}
+
+# Sorted key/value arrays of the mappings above, for searchsorted lookups
+_FTYPE_KEYS = np.array(sorted(FACILITY_TYPE_MAPPINGS))
+_FTYPE_VALS = np.array([FACILITY_TYPE_MAPPINGS[k] for k in _FTYPE_KEYS], dtype=object)
+_OWNERSHIP_KEYS = np.array(sorted(OWNERSHIP_MAPPINGS))
+_OWNERSHIP_VALS = np.array([OWNERSHIP_MAPPINGS[k] for k in _OWNERSHIP_KEYS], dtype=object)
+
+# Patterns for deduplication name keys: punctuation is dropped, then runs
+# of whitespace collapse to one space. Kept as strings so Arrow-backed
+# columns run them in the native regex engine; a compiled re.Pattern
+# makes pandas fall back to Python's re row by row
+NAME_PUNCTUATION_PATTERN = r'[^\w\s]'
+NAME_WHITESPACE_PATTERN = r'\s+'
+
+# Bucket code for a missing coordinate; real buckets of |coord| <= 180
+# scaled by at most 1e4 never reach it
+MISSING_BUCKET = np.iinfo(np.int32).min
+
+# Preprocessed frames already loaded by this process, keyed on the file
+# version and column selection; the least recently used entry is evicted
+_DATA_CACHE: 'OrderedDict[tuple, pd.DataFrame]' = OrderedDict()
+DATA_CACHE_SIZE = 4
+
+
+def recode_distinct(values: pd.Series, codes: np.ndarray, mapped: Any, missing: Any = np.nan) -> pd.Series:
+    """Categorical Series giving each row the mapped value of its factorize code
+
+    Only the integer codes are touched per row; distinct values that map to
+    the same result share one category. Missing values become missing.
+    """
+    # Code -1 (missing) picks the trailing missing value; a NaN there is
+    # factorized to -1 itself. Object dtype so NaN is never stringified
+    new_codes, categories = pd.factorize(pd.Series([*mapped, missing], dtype=object), sort=True)
+    return pd.Series(pd.Categorical.from_codes(new_codes[codes], categories=categories.astype('str')),
+                     index=values.index, name=values.name)
+
+
+def map_distinct(values: pd.Series, func, missing: Any = np.nan) -> pd.Series:
+    """Apply func to each distinct non-missing value of a Series, returning a categorical"""
+    codes, uniques = pd.factorize(values)
+    return recode_distinct(values, codes, [func(value) for value in uniques], missing)
+
+
+def map_vocabulary(values: pd.Series, keys: np.ndarray, vals: np.ndarray) -> pd.Series:
+    """Replace values whose lowercase form is in the sorted keys with the matching vals"""
+    codes, uniques = pd.factorize(values)
+    uniques = np.asarray(uniques, dtype=object)
+    lowered = np.asarray(pd.Index(uniques, dtype=object).str.lower(), dtype=str)
+    idx = np.searchsorted(keys, lowered).clip(max=len(keys) - 1)
+    hit = keys[idx] == lowered
+    return recode_distinct(values, codes, np.where(hit, vals[idx], uniques))
+
+
+def name_match_key(names: pd.Series) -> pd.Series:
+    """Normalize facility names into the key used to match duplicates"""
+    return (names
+            .str.strip()
+            .str.upper()
+            .str.replace(NAME_PUNCTUATION_PATTERN, '', regex=True)
+            .str.replace(NAME_WHITESPACE_PATTERN, ' ', regex=True))
+
+
+def coordinate_buckets(coords: pd.Series, scale: float) -> np.ndarray:
+    """Round coordinates to 1/scale degree as int32 bucket codes; missing ones get MISSING_BUCKET"""
+    values = coords.to_numpy()
+    if values.dtype.kind != 'f':
+        values = values.astype(np.float64)
+    # Same half-to-even rounding, in the same precision, as Series.round
+    scaled = np.rint(values * scale)
+    buckets = np.full(len(scaled), MISSING_BUCKET, dtype=np.int32)
+    valid = ~np.isnan(scaled)
+    buckets[valid] = scaled[valid]
+    return buckets
+
+
+def copy_for_caller(df: pd.DataFrame) -> pd.DataFrame:
+    """Copy of a cached frame that callers may modify without touching the cache"""
+    # Under copy-on-write (always on from pandas 3) a shallow copy is enough:
+    # the first write to a column copies it. Without it, edits would reach
+    # the cached data, so the data itself is copied
+    copy_on_write = (int(pd.__version__.split('.')[0]) >= 3
+                     or pd.get_option('mode.copy_on_write') is True)
+    return df.copy(deep=not copy_on_write)
+
+
+def clean_text(value: Any) -> str:
+    """Strip a text value; the literal 'nan' left by string conversion becomes empty"""
+    text = str(value).strip()
+    return '' if text == 'nan' else text
+
 
 class DataLoader:
     """Handles loading and preprocessing of healthcare facilities data"""
@@ -25,38 +158,136 @@ class DataLoader:
         
         self.use_deduplicated = use_deduplicated
         self.master_file = "NHA_Master_deduplicated.csv" if use_deduplicated else "NHA_Master_merged_TEST.csv"
+        # Location found by find_master_file, reused by later loads
+        self._resolved_path: Optional[Path] = None
+    
+    def find_master_file(self) -> Optional[Path]:
+        """Return the first existing location of the master dataset CSV"""
+        if self._resolved_path is not None:
+            return self._resolved_path
+        
+        # Try different possible locations for the data file; $NHA_DATA_DIR
+        # points at a data directory outside the project
+        possible_dirs = [self.data_dir, Path.cwd(), Path.cwd().parent]
+        if os.environ.get('NHA_DATA_DIR'):
+            possible_dirs.append(Path(os.environ['NHA_DATA_DIR']))
+        self._resolved_path = next(
+            (path for path in (d / self.master_file for d in possible_dirs) if path.is_file()), None
+        )
+        return self._resolved_path
+    
+    def master_file_key(self) -> Optional[tuple]:
+        """(path, mtime, size) of the master dataset CSV, which changes whenever the file does"""
+        path = self.find_master_file()
+        if path is None:
+            return None
+        stat = path.stat()
+        return (str(path), stat.st_mtime_ns, stat.st_size)
+        
+    def load_master_dataset(self, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Load the main NHA master dataset
+        
+        Args:
+            columns: Optional subset of columns to load; the coordinate
+                columns are always included. Defaults to all columns.
+        """
+        if columns is not None:
+            columns = list(columns) + [c for c in REQUIRED_COLUMNS if c not in columns]
         
-    def load_master_dataset(self) -> Optional[pd.DataFrame]:
-        """Load the main NHA master dataset"""
         try:
-            # Try different possible locations for the data file
-            possible_paths = [
-                self.data_dir / self.master_file,
-                Path.cwd() / self.master_file,
-                Path.cwd().parent / self.master_file,
-                Path("/Users/ankitraj2/asar master data") / self.master_file
-            ]
-            
-            df = None
-            for path in possible_paths:
-                if path.exists():
-                    logger.info(f"Loading data from: {path}")
-                    df = pd.read_csv(path)
-                    break
-            
-            if df is None:
+            file_key = self.master_file_key()
+            if file_key is None:
                 logger.error(f"Could not find {self.master_file} in any expected location")
                 return None
             
-            # Preprocess the data
-            df = self._preprocess_data(df)
+            path = self.find_master_file()
+            key = (*file_key, tuple(columns) if columns is not None else None)
+            df = _DATA_CACHE.get(key)
+            if df is not None:
+                _DATA_CACHE.move_to_end(key)
+                return copy_for_caller(df)
+            
+            df = self._read_preprocessed(path, columns)
+            if df is None:
+                # Preprocess the data
+                logger.info(f"Loading data from: {path}")
+                df = self._preprocess_data(self._read_csv(path))
+                self._write_preprocessed(path, df)
+                if columns is not None:
+                    df = df[columns]
             logger.info(f"Successfully loaded and preprocessed {len(df):,} facilities")
-            return df
+            
+            _DATA_CACHE[key] = df
+            if len(_DATA_CACHE) > DATA_CACHE_SIZE:
+                _DATA_CACHE.popitem(last=False)
+            return copy_for_caller(df)
             
         except Exception as e:
             logger.error(f"Error loading master dataset: {e}")
             return None
     
+    def _preprocessed_stamp(self, csv_path: Path) -> Dict[str, Any]:
+        """Inputs of the preprocessed cache: the CSV, the preprocessing code and the libraries"""
+        csv_stat = csv_path.stat()
+        return {
+            'csv_mtime_ns': csv_stat.st_mtime_ns,
+            'csv_size': csv_stat.st_size,
+            'loader_mtime_ns': Path(__file__).stat().st_mtime_ns,
+            # Missing strings and dtypes read back differently across versions
+            'pandas_version': pd.__version__,
+            'pyarrow_version': pa.__version__ if ARROW_AVAILABLE else None,
+        }
+    
+    def _read_preprocessed(self, csv_path: Path, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+        """Return the cached preprocessed dataset, or None if missing or stale"""
+        cache_path = csv_path.with_suffix(PREPROCESSED_SUFFIX)
+        stamp_path = cache_path.with_suffix('.stamp')
+        try:
+            if json.loads(stamp_path.read_text()) != self._preprocessed_stamp(csv_path):
+                return None
+            logger.info(f"Loading preprocessed data from: {cache_path}")
+            return pd.read_parquet(cache_path, columns=columns)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable preprocessed cache {cache_path}: {e}")
+            return None
+    
+    def _write_preprocessed(self, csv_path: Path, df: pd.DataFrame) -> None:
+        """Cache the preprocessed dataset so later loads skip parsing and preprocessing"""
+        cache_path = csv_path.with_suffix(PREPROCESSED_SUFFIX)
+        stamp_path = cache_path.with_suffix('.stamp')
+        try:
+            # Category columns are stored as dictionary pages and read back as category
+            df.to_parquet(cache_path, compression='zstd')
+            stamp_path.write_text(json.dumps(self._preprocessed_stamp(csv_path)))
+            logger.info(f"Saved preprocessed data to: {cache_path}")
+        except Exception as e:
+            logger.warning(f"Could not write preprocessed cache {cache_path}: {e}")
+    
+    def _read_csv(self, csv_path: Path) -> pd.DataFrame:
+        """Parse a CSV with Arrow's multithreaded reader, falling back to pandas"""
+        if not ARROW_AVAILABLE:
+            return pd.read_csv(csv_path, low_memory=False)
+        try:
+            table = pa_csv.read_csv(
+                csv_path,
+                read_options=pa_csv.ReadOptions(use_threads=True, block_size=16 << 20),
+                convert_options=pa_csv.ConvertOptions(
+                    strings_can_be_null=True,
+                    # Low-cardinality text is parsed straight into category
+                    # dtype; coordinates stay text since some carry stray
+                    # Unicode marks that preprocessing coerces to NaN
+                    column_types={col: pa.dictionary(pa.int32(), pa.string()) for col in CATEGORICAL_COLUMNS},
+                ),
+            )
+        except pa.ArrowInvalid as e:
+            # Arrow fixes column types from the first block and rejects later
+            # rows that do not fit; pandas infers over the whole file
+            logger.info(f"Arrow CSV reader failed ({e}), falling back to pandas")
+            return pd.read_csv(csv_path, low_memory=False)
+        return table.to_pandas(self_destruct=True, split_blocks=True)
+    
     def _preprocess_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Preprocess the healthcare facilities data"""
         try:
@@ -65,25 +296,30 @@ class DataLoader:
             df['Longitude'] = pd.to_numeric(df['Longitude'], errors='coerce')
             
             # Remove rows with invalid coordinates
-            valid_coords = (
-                df['Latitude'].notna() & 
-                df['Longitude'].notna() &
-                (df['Latitude'].between(-90, 90)) & 
-                (df['Longitude'].between(-180, 180))
-            )
+            # NaN compares False, so the range checks also drop missing coordinates
+            lat = df['Latitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+            lon = df['Longitude'].to_numpy(dtype=np.float64, na_value=np.nan)
+            valid_coords = (np.abs(lat) <= 90) & (np.abs(lon) <= 180)
             
             original_count = len(df)
-            df = df[valid_coords].copy()
+            # Boolean indexing already returns a new frame, and under
+            # copy-on-write the column writes below never reach the input
+            df = df[valid_coords]
             removed_count = original_count - len(df)
             
             if removed_count > 0:
                 logger.warning(f"Removed {removed_count} facilities with invalid coordinates")
             
-            # Clean text fields
+            # Clean text fields; categorical ones hold a handful of distinct
+            # values, so those are cleaned once per value rather than per row
             text_columns = ['Name', 'Address', 'Facility Type', 'Ownership']
             for col in text_columns:
-                if col in df.columns:
-                    df[col] = df[col].astype(str).str.strip()
+                if col in df.columns and col in CATEGORICAL_COLUMNS:
+                    df[col] = map_distinct(df[col], clean_text, missing='')
+                elif col in df.columns:
+                    # fillna first: Arrow and Parquet reads give None for
+                    # missing strings, which astype(str) would keep as 'None'
+                    df[col] = df[col].fillna('').astype(str).str.strip()
                     df[col] = df[col].replace('nan', '')
             
             # Standardize facility types
@@ -94,6 +330,12 @@ class DataLoader:
             if 'Ownership' in df.columns:
                 df['Ownership'] = self._standardize_ownership(df['Ownership'])
             
+            # Category dtype keeps one copy of each distinct value; filters,
+            # grouping and color lookups then work on the integer codes
+            for col in CATEGORICAL_COLUMNS:
+                if col in df.columns:
+                    df[col] = df[col].astype('category')
+            
             logger.info(f"Data preprocessing completed successfully")
             return df
             
@@ -103,36 +345,11 @@ class DataLoader:
     
     def _standardize_facility_types(self, facility_types: pd.Series) -> pd.Series:
         """Standardize facility type names"""
-        type_mapping = {
-            'phc': 'Primary Health Centre',
-            'primary health centre': 'Primary Health Centre',
-            'chc': 'Community Health Centre', 
-            'community health centre': 'Community Health Centre',
-            'hospital': 'Hospital',
-            'clinic': 'Clinic/ Dispensary',
-            'dispensary': 'Clinic/ Dispensary',
-            'clinic/ dispensary': 'Clinic/ Dispensary',
-            'sub centre': 'Sub Centre',
-            'subcentre': 'Sub Centre',
-            'pharmacy': 'Pharmacy'
-        }
-        
-        standardized = facility_types.str.lower().map(type_mapping)
-        return standardized.fillna(facility_types)
+        return map_vocabulary(facility_types, _FTYPE_KEYS, _FTYPE_VALS)
     
     def _standardize_ownership(self, ownership: pd.Series) -> pd.Series:
         """Standardize ownership types"""
-        ownership_mapping = {
-            'govt': 'Government',
-            'government': 'Government',
-            'public': 'Government',
-            'private': 'Private',
-            'ppp': 'PPP',
-            'public private partnership': 'PPP'
-        }
-        
-        standardized = ownership.str.lower().map(ownership_mapping)
-        return standardized.fillna(ownership)
+        return map_vocabulary(ownership, _OWNERSHIP_KEYS, _OWNERSHIP_VALS)
     
     def deduplicate_by_name(self, df: pd.DataFrame, strategy: str = 'comprehensive') -> pd.DataFrame:
         """
@@ -175,100 +392,86 @@ class DataLoader:
     
     def _simple_name_deduplication(self, df: pd.DataFrame) -> pd.DataFrame:
         """Simple deduplication keeping first occurrence of each name"""
-        # Clean names for better matching
-        df_copy = df.copy()
-        df_copy['Name_cleaned'] = df_copy['Name'].str.strip().str.upper()
-        
-        # Keep first occurrence of each cleaned name
-        deduplicated = df_copy.drop_duplicates(subset=['Name_cleaned'], keep='first')
-        
-        # Remove the temporary column
-        deduplicated = deduplicated.drop('Name_cleaned', axis=1)
+        # Clean names for better matching; the key is built on the side so
+        # the input frame is never copied or modified
+        name_cleaned = df['Name'].str.strip().str.upper()
         
-        return deduplicated
+        # Keep first occurrence of each cleaned name. A hashed duplicated()
+        # mask needs no sort; groupby(...).first() measured ~8x slower, drops
+        # rows without a name and takes the first non-null value per column
+        return df[~name_cleaned.duplicated(keep='first')]
     
     def _comprehensive_deduplication(self, df: pd.DataFrame) -> pd.DataFrame:
         """Comprehensive deduplication using name + location"""
-        df_copy = df.copy()
-        
-        # Clean and normalize names
-        df_copy['Name_cleaned'] = (df_copy['Name']
-                                  .str.strip()
-                                  .str.upper()
-                                  .str.replace(r'[^\w\s]', '', regex=True)
-                                  .str.replace(r'\s+', ' ', regex=True))
-        
-        # Round coordinates to reduce minor GPS variations
-        df_copy['Lat_rounded'] = df_copy['Latitude'].round(4)
-        df_copy['Lon_rounded'] = df_copy['Longitude'].round(4)
-        
-        # Create composite key for deduplication
-        dedup_columns = ['Name_cleaned', 'Lat_rounded', 'Lon_rounded']
-        
-        # Remove exact duplicates first
-        deduplicated = df_copy.drop_duplicates(subset=dedup_columns, keep='first')
-        
-        # Handle cases where same name exists at different locations
-        # This keeps facilities with same name but different locations
-        
-        # Clean up temporary columns
-        deduplicated = deduplicated.drop(['Name_cleaned', 'Lat_rounded', 'Lon_rounded'], axis=1)
+        return df[self._comprehensive_keep_mask(df, name_match_key(df['Name']))]
+    
+    def _comprehensive_keep_mask(self, df: pd.DataFrame, name_key: pd.Series) -> pd.Series:
+        """Mask of the rows kept by comprehensive deduplication, given the name keys"""
+        # Composite key of cleaned name and coordinates rounded to 1e-4
+        # degree (to absorb minor GPS variations), built apart from the
+        # input frame; int32 buckets hash faster than rounded floats
+        dedup_keys = pd.DataFrame({
+            'Name_cleaned': name_key,
+            'Lat_rounded': coordinate_buckets(df['Latitude'], 1e4),
+            'Lon_rounded': coordinate_buckets(df['Longitude'], 1e4),
+        }, index=df.index)
         
-        return deduplicated
+        # Remove exact duplicates; facilities with the same name at
+        # different locations are kept
+        return ~dedup_keys.duplicated(keep='first')
     
     def _intelligent_deduplication(self, df: pd.DataFrame) -> pd.DataFrame:
         """Intelligent deduplication with fuzzy name matching and location clustering"""
         try:
-            from difflib import SequenceMatcher
-            df_copy = df.copy()
-            
-            # Start with comprehensive deduplication first
-            deduplicated = self._comprehensive_deduplication(df_copy)
+            from rapidfuzz import fuzz, process
             
-            # Clean names for fuzzy matching
-            deduplicated['Name_cleaned'] = (deduplicated['Name']
-                                          .str.strip()
-                                          .str.upper()
-                                          .str.replace(r'[^\w\s]', '', regex=True)
-                                          .str.replace(r'\s+', ' ', regex=True))
+            # Start with comprehensive deduplication first; its name keys
+            # are reused for fuzzy matching
+            name_key = name_match_key(df['Name'])
+            keep = self._comprehensive_keep_mask(df, name_key)
+            deduplicated = df[keep]
+            names = name_key[keep].to_numpy()
             
             # Further fuzzy matching for similar names at similar locations
             tolerance_km = 1.0  # 1 km tolerance for location matching
             similarity_threshold = 0.9  # 90% name similarity
             
-            # Group by approximate location (rounded coordinates)
-            deduplicated['Lat_group'] = (deduplicated['Latitude'] * 100).round() / 100
-            deduplicated['Lon_group'] = (deduplicated['Longitude'] * 100).round() / 100
+            # Group by approximate location (coordinates rounded to 0.01
+            # degree), packing both int32 buckets into one int64 key; rows
+            # without coordinates join no group
+            lat_group = coordinate_buckets(deduplicated['Latitude'], 1e2)
+            lon_group = coordinate_buckets(deduplicated['Longitude'], 1e2)
+            located = np.flatnonzero((lat_group != MISSING_BUCKET) & (lon_group != MISSING_BUCKET))
+            location_key = (lat_group.astype(np.int64) << 32) | (lon_group.astype(np.int64) & 0xFFFFFFFF)
             
-            to_remove = set()
+            # Row positions of each location group, as plain arrays
+            groups = pd.Series(located).groupby(location_key[located], sort=False).indices
             
-            for (lat_group, lon_group), group in deduplicated.groupby(['Lat_group', 'Lon_group']):
-                if len(group) < 2:
+            to_remove = np.zeros(len(deduplicated), dtype=bool)
+            
+            for members in groups.values():
+                if len(members) < 2:
                     continue
+                positions = located[members]
                 
-                # Compare names within each location group
-                names = group['Name_cleaned'].tolist()
-                indices = group.index.tolist()
+                # Compare names within each location group: all pairs in one
+                # native, multithreaded call (scores below the cutoff are 0)
+                similar = process.cdist(
+                    names[positions], names[positions], scorer=fuzz.ratio,
+                    score_cutoff=similarity_threshold * 100, dtype=np.float64, workers=-1,
+                ) >= similarity_threshold * 100
                 
-                for i in range(len(names)):
-                    if indices[i] in to_remove:
+                removed = np.zeros(len(positions), dtype=bool)
+                for i in range(len(positions)):
+                    if removed[i]:
                         continue
-                    
-                    for j in range(i + 1, len(names)):
-                        if indices[j] in to_remove:
-                            continue
-                        
-                        similarity = SequenceMatcher(None, names[i], names[j]).ratio()
-                        if similarity >= similarity_threshold:
-                            # Mark the second occurrence for removal
-                            to_remove.add(indices[j])
+                    # Mark later occurrences similar to a kept name for removal
+                    later = similar[i, i + 1:] & ~removed[i + 1:]
+                    removed[i + 1:] |= later
+                to_remove[positions[removed]] = True
             
             # Remove fuzzy duplicates
-            final_deduplicated = deduplicated.drop(index=to_remove)
-            
-            # Clean up temporary columns
-            temp_cols = ['Name_cleaned', 'Lat_group', 'Lon_group']
-            final_deduplicated = final_deduplicated.drop([col for col in temp_cols if col in final_deduplicated.columns], axis=1)
+            final_deduplicated = deduplicated[~to_remove]
             
             return final_deduplicated
             
@@ -283,9 +486,10 @@ class DataLoader:
         """Analyze duplicate patterns in the dataset"""
         analysis = {}
         
-        # Basic duplicate analysis
+        # Basic duplicate analysis; one value_counts pass serves every statistic
         total_records = len(df)
-        unique_names = df['Name'].nunique()
+        name_counts = df['Name'].value_counts()
+        unique_names = len(name_counts)
         
         analysis['summary'] = {
             'total_records': total_records,
@@ -295,7 +499,6 @@ class DataLoader:
         }
         
         # Top duplicates
-        name_counts = df['Name'].value_counts()
         duplicates = name_counts[name_counts > 1]
         
         analysis['top_duplicates'] = duplicates.head(20).to_dict()
@@ -306,25 +509,29 @@ class DataLoader:
         
         # Geographic spread of duplicates
         if 'Latitude' in df.columns and 'Longitude' in df.columns:
-            geographic_analysis = {}
+            # One pass over the rows of the top names instead of a full Name
+            # scan per name; spreads and the heuristic are computed per column
+            top_names = duplicates.head(10).index
+            facilities = df.loc[df['Name'].isin(top_names), ['Name', 'Latitude', 'Longitude']]
+            counts = facilities['Name'].value_counts()
+            coords = facilities.dropna(subset=['Latitude', 'Longitude']).groupby('Name', observed=True, sort=False)
             
-            for name in duplicates.head(10).index:
-                facilities = df[df['Name'] == name]
-                if len(facilities) > 1:
-                    coords = facilities[['Latitude', 'Longitude']].dropna()
-                    if len(coords) > 1:
-                        # Calculate coordinate spread
-                        lat_spread = coords['Latitude'].max() - coords['Latitude'].min()
-                        lon_spread = coords['Longitude'].max() - coords['Longitude'].min()
-                        
-                        geographic_analysis[name] = {
-                            'count': len(facilities),
-                            'coordinate_spread': {
-                                'latitude': round(lat_spread, 4),
-                                'longitude': round(lon_spread, 4)
-                            },
-                            'likely_duplicates': lat_spread < 0.01 and lon_spread < 0.01
-                        }
+            spread = coords.max() - coords.min()
+            spread = spread[coords.size() > 1].reindex(top_names).dropna()
+            likely = np.where((spread['Latitude'] < 0.01) & (spread['Longitude'] < 0.01), True, False)
+            
+            geographic_analysis = {
+                name: {
+                    'count': int(counts[name]),
+                    'coordinate_spread': {
+                        'latitude': round(lat_spread, 4),
+                        'longitude': round(lon_spread, 4)
+                    },
+                    'likely_duplicates': is_likely
+                }
+                for name, lat_spread, lon_spread, is_likely
+                in zip(spread.index, spread['Latitude'], spread['Longitude'], likely)
+            }
             
             analysis['geographic_patterns'] = geographic_analysis
         
@@ -332,14 +539,15 @@ class DataLoader:
 
     def get_data_info(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Get comprehensive information about the dataset"""
+        valid_coordinates = int((df['Latitude'].notna() & df['Longitude'].notna()).sum())
         info = {
             'total_facilities': len(df),
             'facility_types': df['Facility Type'].value_counts().to_dict(),
             'ownership_distribution': df['Ownership'].value_counts().to_dict(),
             'columns': list(df.columns),
             'coordinate_coverage': {
-                'valid_coordinates': len(df[df['Latitude'].notna() & df['Longitude'].notna()]),
-                'missing_coordinates': len(df[df['Latitude'].isna() | df['Longitude'].isna()])
+                'valid_coordinates': valid_coordinates,
+                'missing_coordinates': len(df) - valid_coordinates
             }
         }
         